@@ -4,11 +4,29 @@ from app.controllers import pwd_controller
 from app.controllers import benefit_controller
 from app.controllers import visit_controller
 from app.controllers import assistance_drive_controller
+from app.controllers import stats_controller
+from app.controllers import beneficiary_controller
+from app.controllers import import_controller
+from app.controllers import export_controller
+from app.controllers import search_controller
+from app.controllers import dedup_controller
+from app.controllers import seed_controller
+from app.controllers import timeline_controller
+from app.controllers import sync_controller
 
 __all__ = [
     "senior_controller",
     "pwd_controller",
     "benefit_controller",
     "visit_controller",
-    "assistance_drive_controller"
+    "assistance_drive_controller",
+    "stats_controller",
+    "beneficiary_controller",
+    "import_controller",
+    "export_controller",
+    "search_controller",
+    "dedup_controller",
+    "seed_controller",
+    "timeline_controller",
+    "sync_controller"
 ]
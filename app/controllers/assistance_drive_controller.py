@@ -1,18 +1,39 @@
 """Assistance Drive controller."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
+from sqlalchemy import delete, exists, func, insert, literal, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException
 
+from app.controllers import stats_controller
+from app.utils.cache import record_cache
+from app.utils.pagination import keyset_filter
+from app.utils.writer import single_writer
 from app.models.assistance_drive import (
     AssistanceDrive,
     AssistanceDriveCreate,
     AssistanceDriveUpdate,
-    AssistanceDriveResponse
+    AssistanceDriveResponse,
+    AssistanceDriveDistribution,
+    AssistanceDriveDistributionResult
 )
+from app.models.benefit import Benefit
+from app.models.pwd import PWD
+from app.models.senior import Senior
 
+# Beneficiary tables covered by each target_beneficiaries value
+DRIVE_TARGETS = {
+    "senior": [("senior", Senior)],
+    "pwd": [("pwd", PWD)],
+    "both": [("senior", Senior), ("pwd", PWD)],
+}
 
+# Sort key for list pages; the trailing id makes it unique for keyset cursors
+SORT_COLUMNS = (AssistanceDrive.start_date, AssistanceDrive.id)
+
+
+@single_writer
 async def create_assistance_drive(
     db: AsyncSession,
     drive: AssistanceDriveCreate
@@ -20,6 +41,7 @@ async def create_assistance_drive(
     """Create a new assistance drive."""
     db_drive = AssistanceDrive(**drive.model_dump())
     db.add(db_drive)
+    await stats_controller.track_change(db, "assistance_drive", None, db_drive.model_dump())
     await db.commit()
     await db.refresh(db_drive)
     return AssistanceDriveResponse.model_validate(db_drive)
@@ -27,22 +49,35 @@ async def create_assistance_drive(
 
 async def get_assistance_drive(
     db: AsyncSession,
-    drive_id: int
-) -> Optional[AssistanceDriveResponse]:
-    """Get a specific assistance drive by ID."""
+    drive_id: int,
+    version: Optional[int] = None
+) -> Tuple[Optional[AssistanceDriveResponse], Optional[int]]:
+    """Get a specific assistance drive by ID and the table version it was read at.
+
+    ``version`` comes from ``check_record_etag``; a cached assistance drive may have
+    been read at an older one. Without it the assistance drive is not cached.
+    """
+    cached = record_cache.get("assistance_drive", drive_id)
+    if cached is not None:
+        return cached
+
+    generation = record_cache.generation
     result = await db.execute(select(AssistanceDrive).where(AssistanceDrive.id == drive_id))
     drive = result.scalar_one_or_none()
-    return AssistanceDriveResponse.model_validate(drive) if drive else None
+    if not drive:
+        return None, version
 
+    response = AssistanceDriveResponse.model_validate(drive)
+    if version is not None:
+        record_cache.set("assistance_drive", drive_id, response, generation, version)
+    return response, version
 
-async def get_assistance_drives(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+
+def list_query(
     status: Optional[str] = None,
     target_beneficiaries: Optional[str] = None
-) -> List[AssistanceDriveResponse]:
-    """Get all assistance drives with optional filtering."""
+):
+    """Build the filtered assistance drives query shared by listing and export."""
     query = select(AssistanceDrive)
     
     if status:
@@ -50,44 +85,176 @@ async def get_assistance_drives(
     if target_beneficiaries:
         query = query.where(AssistanceDrive.target_beneficiaries == target_beneficiaries)
     
-    query = query.offset(skip).limit(limit).order_by(AssistanceDrive.start_date.desc())
-    result = await db.execute(query)
-    drives = result.scalars().all()
-    return [AssistanceDriveResponse.model_validate(drive) for drive in drives]
+    return query
 
 
+async def get_assistance_drives(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    target_beneficiaries: Optional[str] = None,
+    after: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Get all assistance drives with optional filtering."""
+    query = list_query(status, target_beneficiaries)
+    
+    if after:
+        query = query.where(keyset_filter(SORT_COLUMNS, after, descending=True))
+    
+    query = query.order_by(*(column.desc() for column in SORT_COLUMNS)).offset(skip).limit(limit)
+    # Plain column rows need no per-row model validation; DB output is trusted
+    result = await db.execute(query.with_only_columns(*AssistanceDrive.__table__.c))
+    columns = list(result.keys())
+    return [dict(zip(columns, row)) for row in result]
+
+
+@single_writer
 async def update_assistance_drive(
     db: AsyncSession,
     drive_id: int,
     drive_update: AssistanceDriveUpdate
 ) -> AssistanceDriveResponse:
-    """Update an assistance drive."""
-    result = await db.execute(select(AssistanceDrive).where(AssistanceDrive.id == drive_id))
-    drive = result.scalar_one_or_none()
-    
-    if not drive:
-        raise HTTPException(status_code=404, detail="Assistance drive not found")
-    
+    """Update an assistance drive with a single UPDATE ... RETURNING."""
     update_data = drive_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = date.today()
-    
-    for field, value in update_data.items():
-        setattr(drive, field, value)
-    
+
+    old = None
+    if "status" in update_data:
+        # Counters need the previous status; read just that column
+        result = await db.execute(select(AssistanceDrive.status).where(AssistanceDrive.id == drive_id))
+        old = result.mappings().one_or_none()
+
+    result = await db.execute(
+        update(AssistanceDrive)
+        .where(AssistanceDrive.id == drive_id)
+        .values(**update_data)
+        .returning(*AssistanceDrive.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    drive = result.mappings().one_or_none()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Assistance drive not found")
+
+    await stats_controller.track_change(db, "assistance_drive", old if old is not None else drive, drive)
     await db.commit()
-    await db.refresh(drive)
-    return AssistanceDriveResponse.model_validate(drive)
+    record_cache.invalidate("assistance_drive", drive_id)
+    return AssistanceDriveResponse.model_validate(dict(drive))
 
 
+@single_writer
 async def delete_assistance_drive(db: AsyncSession, drive_id: int) -> bool:
-    """Delete an assistance drive."""
+    """Delete an assistance drive with a single DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(AssistanceDrive)
+        .where(AssistanceDrive.id == drive_id)
+        .returning(AssistanceDrive.status)
+        .execution_options(synchronize_session=False)
+    )
+    drive = result.mappings().one_or_none()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Assistance drive not found")
+
+    await stats_controller.track_change(db, "assistance_drive", drive, None)
+    await db.commit()
+    record_cache.invalidate("assistance_drive", drive_id)
+    return True
+
+
+
+def _eligible_benefits(
+    drive: AssistanceDrive,
+    distribution: AssistanceDriveDistribution,
+    beneficiary_type: str,
+    model
+):
+    """SELECT producing one benefit row per eligible beneficiary."""
+    distribution_date = distribution.distribution_date or drive.start_date
+    values = {
+        "beneficiary_type": beneficiary_type,
+        "benefit_type": distribution.benefit_type,
+        "amount": distribution.amount,
+        "description": distribution.description or drive.drive_name,
+        "distribution_date": distribution_date,
+        "distributed_by": distribution.distributed_by or drive.organizer,
+        "status": distribution.status,
+        "created_at": date.today(),
+        "updated_at": date.today(),
+    }
+    columns = Benefit.__table__.c
+    query = select(
+        *(literal(value, type_=columns[name].type).label(name) for name, value in values.items()),
+        model.id.label("beneficiary_id")
+    ).where(model.is_active == true())
+
+    if distribution.barangay:
+        query = query.where(model.barangay == distribution.barangay)
+    if distribution.gender:
+        query = query.where(model.gender == distribution.gender)
+    if distribution.born_on_or_before:
+        query = query.where(model.birth_date <= distribution.born_on_or_before)
+    if distribution.disability_type and model is PWD:
+        query = query.where(PWD.disability_type == distribution.disability_type)
+
+    # Skip beneficiaries that already have this benefit, so reruns are harmless
+    already_given = exists().where(
+        Benefit.beneficiary_type == beneficiary_type,
+        Benefit.beneficiary_id == model.id,
+        Benefit.benefit_type == distribution.benefit_type,
+        Benefit.distribution_date == distribution_date
+    )
+    return query.where(~already_given), [*values, "beneficiary_id"]
+
+
+@single_writer
+async def distribute_benefits(
+    db: AsyncSession,
+    drive_id: int,
+    distribution: AssistanceDriveDistribution
+) -> AssistanceDriveDistributionResult:
+    """Create a benefit for every eligible active beneficiary of a drive."""
     result = await db.execute(select(AssistanceDrive).where(AssistanceDrive.id == drive_id))
     drive = result.scalar_one_or_none()
     
     if not drive:
         raise HTTPException(status_code=404, detail="Assistance drive not found")
+    if drive.target_beneficiaries not in DRIVE_TARGETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported target_beneficiaries {drive.target_beneficiaries!r}"
+        )
+    
+    created = {"senior": 0, "pwd": 0}
+    for beneficiary_type, model in DRIVE_TARGETS[drive.target_beneficiaries]:
+        source, columns = _eligible_benefits(drive, distribution, beneficiary_type, model)
+        insert_result = await db.execute(insert(Benefit).from_select(columns, source))
+        created[beneficiary_type] = insert_result.rowcount
+    total = created["senior"] + created["pwd"]
+    
+    if total:
+        await db.execute(
+            update(AssistanceDrive)
+            .where(AssistanceDrive.id == drive_id)
+            .values(
+                participants_count=func.coalesce(AssistanceDrive.participants_count, 0) + total,
+                updated_at=date.today()
+            )
+        )
+        await stats_controller.adjust_counters(db, {
+            "benefit.total": total,
+            f"benefit.status.{distribution.status}": total,
+            stats_controller.version_key("benefit"): 1,
+            stats_controller.version_key("assistance_drive"): 1
+        })
     
-    await db.delete(drive)
     await db.commit()
-    return True
-
+    record_cache.invalidate("assistance_drive", drive_id)
+    await db.refresh(drive)
+    return AssistanceDriveDistributionResult(
+        drive=AssistanceDriveResponse.model_validate(drive),
+        seniors=created["senior"],
+        pwds=created["pwd"],
+        benefits_created=total
+    )
@@ -0,0 +1,54 @@
+"""Beneficiary lookup controller.
+
+Benefits and visits reference a senior or a PWD through the polymorphic
+(``beneficiary_type``, ``beneficiary_id``) pair, which has no foreign key
+to join on. ``attach_beneficiaries`` resolves a whole page of them with
+one ``IN (...)`` query per beneficiary table.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.pwd import PWD
+from app.models.senior import Senior
+
+BENEFICIARY_MODELS = {"senior": Senior, "pwd": PWD}
+
+
+def full_name(last_name: str, first_name: str, middle_name: Optional[str]) -> str:
+    """Format a beneficiary name as 'Last, First M.'."""
+    name = f"{last_name}, {first_name}"
+    if middle_name:
+        name += f" {middle_name[0]}."
+    return name
+
+
+async def attach_beneficiaries(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add a ``beneficiary`` summary to each benefit or visit row.
+
+    Rows whose beneficiary no longer exists get ``None``.
+    """
+    ids: Dict[str, Set[int]] = defaultdict(set)
+    for row in rows:
+        ids[row["beneficiary_type"]].add(row["beneficiary_id"])
+
+    found: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for beneficiary_type, model in BENEFICIARY_MODELS.items():
+        if not ids[beneficiary_type]:
+            continue
+        result = await db.execute(
+            select(model.id, model.last_name, model.first_name, model.middle_name, model.barangay, model.is_active)
+            .where(model.id.in_(ids[beneficiary_type]))
+        )
+        for person in result:
+            found[(beneficiary_type, person.id)] = {
+                "id": person.id,
+                "full_name": full_name(person.last_name, person.first_name, person.middle_name),
+                "barangay": person.barangay,
+                "is_active": person.is_active,
+            }
+
+    for row in rows:
+        row["beneficiary"] = found.get((row["beneficiary_type"], row["beneficiary_id"]))
+    return rows
@@ -1,38 +1,81 @@
 """Benefit controller."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException
 
+from app.controllers import beneficiary_controller, stats_controller
+from app.utils.cache import record_cache
+from app.utils.group_commit import group_commit
+from app.utils.pagination import keyset_filter
+from app.utils.writer import single_writer
 from app.models.benefit import Benefit, BenefitCreate, BenefitUpdate, BenefitResponse
 
+# Sort key for list pages; the trailing id makes it unique for keyset cursors
+SORT_COLUMNS = (Benefit.distribution_date, Benefit.id)
 
-async def create_benefit(db: AsyncSession, benefit: BenefitCreate) -> BenefitResponse:
-    """Create a new benefit."""
+
+async def _stage_benefit(db: AsyncSession, benefit: BenefitCreate) -> BenefitResponse:
+    """Add a new benefit to the session's transaction without committing."""
     db_benefit = Benefit(**benefit.model_dump())
     db.add(db_benefit)
-    await db.commit()
-    await db.refresh(db_benefit)
+    await stats_controller.track_change(db, "benefit", None, db_benefit.model_dump())
+    await db.flush()
     return BenefitResponse.model_validate(db_benefit)
 
 
-async def get_benefit(db: AsyncSession, benefit_id: int) -> Optional[BenefitResponse]:
-    """Get a specific benefit by ID."""
+async def create_benefit(db: AsyncSession, benefit: BenefitCreate) -> BenefitResponse:
+    """Create a new benefit.
+
+    With group commit on, the insert is committed together with other
+    creates arriving at the same time instead of in ``db``.
+    """
+    if group_commit.enabled:
+        return await group_commit.submit(_stage_benefit, benefit)
+    return await _create_benefit(db, benefit)
+
+
+@single_writer
+async def _create_benefit(db: AsyncSession, benefit: BenefitCreate) -> BenefitResponse:
+    response = await _stage_benefit(db, benefit)
+    await db.commit()
+    return response
+
+
+async def get_benefit(
+    db: AsyncSession,
+    benefit_id: int,
+    version: Optional[int] = None
+) -> Tuple[Optional[BenefitResponse], Optional[int]]:
+    """Get a specific benefit by ID and the table version it was read at.
+
+    ``version`` comes from ``check_record_etag``; a cached benefit may have
+    been read at an older one. Without it the benefit is not cached.
+    """
+    cached = record_cache.get("benefit", benefit_id)
+    if cached is not None:
+        return cached
+
+    generation = record_cache.generation
     result = await db.execute(select(Benefit).where(Benefit.id == benefit_id))
     benefit = result.scalar_one_or_none()
-    return BenefitResponse.model_validate(benefit) if benefit else None
+    if not benefit:
+        return None, version
 
+    response = BenefitResponse.model_validate(benefit)
+    if version is not None:
+        record_cache.set("benefit", benefit_id, response, generation, version)
+    return response, version
 
-async def get_benefits(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+
+def list_query(
     beneficiary_type: Optional[str] = None,
     beneficiary_id: Optional[int] = None,
     status: Optional[str] = None
-) -> List[BenefitResponse]:
-    """Get all benefits with optional filtering."""
+):
+    """Build the filtered benefits query shared by listing and export."""
     query = select(Benefit)
     
     if beneficiary_type:
@@ -42,44 +85,89 @@ async def get_benefits(
     if status:
         query = query.where(Benefit.status == status)
     
-    query = query.offset(skip).limit(limit).order_by(Benefit.distribution_date.desc())
-    result = await db.execute(query)
-    benefits = result.scalars().all()
-    return [BenefitResponse.model_validate(benefit) for benefit in benefits]
+    return query
 
 
+async def get_benefits(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    beneficiary_type: Optional[str] = None,
+    beneficiary_id: Optional[int] = None,
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    expand_beneficiary: bool = False
+) -> List[Dict[str, Any]]:
+    """Get all benefits with optional filtering.
+
+    With ``expand_beneficiary`` each row also gets a ``beneficiary``
+    summary, resolved for the whole page in one query per beneficiary table.
+    """
+    query = list_query(beneficiary_type, beneficiary_id, status)
+    
+    if after:
+        query = query.where(keyset_filter(SORT_COLUMNS, after, descending=True))
+    
+    query = query.order_by(*(column.desc() for column in SORT_COLUMNS)).offset(skip).limit(limit)
+    # Plain column rows need no per-row model validation; DB output is trusted
+    result = await db.execute(query.with_only_columns(*Benefit.__table__.c))
+    columns = list(result.keys())
+    rows = [dict(zip(columns, row)) for row in result]
+    if expand_beneficiary:
+        await beneficiary_controller.attach_beneficiaries(db, rows)
+    return rows
+
+
+@single_writer
 async def update_benefit(
     db: AsyncSession,
     benefit_id: int,
     benefit_update: BenefitUpdate
 ) -> BenefitResponse:
-    """Update a benefit."""
-    result = await db.execute(select(Benefit).where(Benefit.id == benefit_id))
-    benefit = result.scalar_one_or_none()
-    
-    if not benefit:
-        raise HTTPException(status_code=404, detail="Benefit not found")
-    
+    """Update a benefit with a single UPDATE ... RETURNING."""
     update_data = benefit_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = date.today()
-    
-    for field, value in update_data.items():
-        setattr(benefit, field, value)
-    
+
+    old = None
+    if "status" in update_data:
+        # Counters need the previous status; read just that column
+        result = await db.execute(select(Benefit.status).where(Benefit.id == benefit_id))
+        old = result.mappings().one_or_none()
+
+    result = await db.execute(
+        update(Benefit)
+        .where(Benefit.id == benefit_id)
+        .values(**update_data)
+        .returning(*Benefit.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    benefit = result.mappings().one_or_none()
+
+    if not benefit:
+        raise HTTPException(status_code=404, detail="Benefit not found")
+
+    await stats_controller.track_change(db, "benefit", old if old is not None else benefit, benefit)
     await db.commit()
-    await db.refresh(benefit)
-    return BenefitResponse.model_validate(benefit)
+    record_cache.invalidate("benefit", benefit_id)
+    return BenefitResponse.model_validate(dict(benefit))
 
 
+@single_writer
 async def delete_benefit(db: AsyncSession, benefit_id: int) -> bool:
-    """Delete a benefit."""
-    result = await db.execute(select(Benefit).where(Benefit.id == benefit_id))
-    benefit = result.scalar_one_or_none()
-    
+    """Delete a benefit with a single DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(Benefit)
+        .where(Benefit.id == benefit_id)
+        .returning(Benefit.status)
+        .execution_options(synchronize_session=False)
+    )
+    benefit = result.mappings().one_or_none()
+
     if not benefit:
         raise HTTPException(status_code=404, detail="Benefit not found")
-    
-    await db.delete(benefit)
+
+    await stats_controller.track_change(db, "benefit", benefit, None)
     await db.commit()
+    record_cache.invalidate("benefit", benefit_id)
     return True
 
@@ -0,0 +1,110 @@
+"""Duplicate registration detection controller."""
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.duplicate import DuplicateCandidate
+from app.models.pwd import PWD, PWDCreate
+from app.models.senior import Senior, SeniorCreate
+from app.utils.dedup import blocking_key, match_score, prepare_record
+
+BENEFICIARY_MODELS = {"senior": Senior, "pwd": PWD}
+ID_NUMBER_FIELDS = {"senior": "osca_id", "pwd": "pwd_id"}
+DEFAULT_MIN_SCORE = 0.75
+YIELD_PER = 2000
+# Blocks larger than this are usually placeholder data (e.g. a default
+# birth date); only their first rows are compared to bound the work.
+MAX_BLOCK_SIZE = 200
+
+
+def _columns(beneficiary_type: str) -> list:
+    """Columns needed to block and score a beneficiary table."""
+    model = BENEFICIARY_MODELS[beneficiary_type]
+    return [
+        model.id, model.first_name, model.middle_name, model.last_name,
+        model.birth_date, model.gender, model.barangay, model.contact_number,
+        getattr(model, ID_NUMBER_FIELDS[beneficiary_type]).label("id_number")
+    ]
+
+
+def _display_name(row) -> str:
+    """Format a beneficiary name as 'Last, First Middle'."""
+    parts = (f"{row['last_name']},", row["first_name"], row["middle_name"])
+    return " ".join(part for part in parts if part)
+
+
+async def find_duplicates(
+    db: AsyncSession,
+    beneficiary_type: str,
+    barangay: Optional[str] = None,
+    min_score: float = DEFAULT_MIN_SCORE,
+    limit: int = 500
+) -> List[DuplicateCandidate]:
+    """Find likely duplicate registrations, best matches first."""
+    model = BENEFICIARY_MODELS[beneficiary_type]
+    query = select(*_columns(beneficiary_type)).order_by(model.id)
+    if barangay:
+        query = query.where(model.barangay == barangay)
+
+    # One pass over the table groups records by blocking key
+    blocks: Dict[tuple, list] = defaultdict(list)
+    result = await db.stream(query.execution_options(yield_per=YIELD_PER))
+    async for row in result.mappings():
+        rows = blocks[blocking_key(row["last_name"], row["birth_date"], row["barangay"])]
+        if len(rows) < MAX_BLOCK_SIZE:
+            rows.append((row, prepare_record(row)))
+
+    candidates = []
+    for rows in blocks.values():
+        if len(rows) < 2:
+            continue
+        for i, (first, first_prepared) in enumerate(rows):
+            for second, second_prepared in rows[i + 1:]:
+                score, reasons = match_score(first_prepared, second_prepared)
+                if score < min_score:
+                    continue
+                # Suggest keeping the record with an OSCA/PWD ID, else the older one
+                keep, duplicate = first, second
+                if second["id_number"] and not first["id_number"]:
+                    keep, duplicate = second, first
+                candidates.append(DuplicateCandidate(
+                    beneficiary_type=beneficiary_type,
+                    keep_id=keep["id"],
+                    duplicate_id=duplicate["id"],
+                    keep_name=_display_name(keep),
+                    duplicate_name=_display_name(duplicate),
+                    score=score,
+                    reasons=reasons
+                ))
+
+    candidates.sort(key=lambda candidate: (-candidate.score, candidate.keep_id))
+    return candidates[:limit]
+
+
+async def find_matches(
+    db: AsyncSession,
+    beneficiary_type: str,
+    record: Union[SeniorCreate, PWDCreate],
+    min_score: float = DEFAULT_MIN_SCORE
+) -> List[int]:
+    """IDs of stored registrations that look like the same person as ``record``.
+
+    Only rows sharing the birth date are read (an index lookup), so this is
+    cheap enough to run on every create.
+    """
+    model = BENEFICIARY_MODELS[beneficiary_type]
+    result = await db.execute(
+        select(*_columns(beneficiary_type)).where(model.birth_date == record.birth_date)
+    )
+    key = blocking_key(record.last_name, record.birth_date, record.barangay)
+    prepared = prepare_record(record.model_dump())
+
+    matches = []
+    for row in result.mappings().all():
+        if blocking_key(row["last_name"], row["birth_date"], row["barangay"]) != key:
+            continue
+        score, _ = match_score(prepare_record(row), prepared)
+        if score >= min_score:
+            matches.append(row["id"])
+    return matches
@@ -0,0 +1,84 @@
+"""Streaming export controller.
+
+Rows are read from a server-side cursor in batches and written out as CSV
+or NDJSON while the query is still running, so exporting the whole
+registry uses constant memory and the first bytes are sent immediately.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Sequence
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+YIELD_PER = 1000
+
+
+def _csv_value(value: Any) -> Any:
+    """Format a value so the file can be re-imported."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> str:
+    """Serialize dates for NDJSON output."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def _stream_rows(
+    session_factory: Callable[[], AsyncSession],
+    query: Select,
+    columns: Sequence[str],
+    file_format: str
+) -> AsyncIterator[str]:
+    """Yield the encoded export one batch of rows at a time."""
+    # The session is owned by the generator so it stays open while streaming
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=YIELD_PER))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        if file_format == "csv":
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        async for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            if file_format == "csv":
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+
+def export_response(
+    session_factory: Callable[[], AsyncSession],
+    query: Select,
+    file_format: str,
+    filename: str
+) -> StreamingResponse:
+    """Stream the rows of a model query as a CSV or NDJSON download."""
+    table = query.column_descriptions[0]["entity"].__table__
+    query = query.with_only_columns(*table.c)
+    columns = [column.name for column in table.c]
+    return StreamingResponse(
+        _stream_rows(session_factory, query, columns, file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'}
+    )
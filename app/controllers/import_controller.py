@@ -0,0 +1,190 @@
+"""Bulk import controller.
+
+Uploaded CSV or NDJSON files are parsed row by row, validated against the
+entity's create schema in chunks, and inserted with one multi-row INSERT
+and one commit per chunk, so memory use does not grow with the file size.
+"""
+import csv
+import io
+import json
+from collections import Counter
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select
+
+from app.controllers import stats_controller
+from app.models.import_report import ImportReport, ImportRowError
+from app.models.pwd import PWD, PWDCreate
+from app.models.senior import Senior, SeniorCreate
+from app.utils.writer import write_lock
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# (line number, parsed record or None, parse error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _detect_format(upload: UploadFile, file_format: Optional[str]) -> str:
+    """Pick the parser from the explicit format, file name or content type."""
+    if file_format:
+        return file_format
+    filename = (upload.filename or "").lower()
+    content_type = (upload.content_type or "").lower()
+    if filename.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+        return "ndjson"
+    raise HTTPException(
+        status_code=400,
+        detail="Cannot detect file format; pass format=csv or format=ndjson"
+    )
+
+
+def _iter_csv(stream: io.TextIOBase) -> Iterator[ParsedRow]:
+    """Parse CSV rows, treating empty cells as missing values."""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        values = {
+            key.strip(): value for key, value in record.items()
+            if key and value not in (None, "")
+        }
+        yield reader.line_num, values, None
+
+
+def _iter_ndjson(stream: io.TextIOBase) -> Iterator[ParsedRow]:
+    """Parse one JSON object per line, skipping blank lines."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, None, f"invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def _format_validation_error(exc: ValidationError) -> List[str]:
+    """Flatten a pydantic error into 'field: message' strings."""
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+async def _import_records(
+    db: AsyncSession,
+    upload: UploadFile,
+    file_format: Optional[str],
+    model: Type[SQLModel],
+    create_schema: Type[SQLModel],
+    entity: str,
+    unique_field: str
+) -> ImportReport:
+    """Validate and insert uploaded records chunk by chunk."""
+    file_format = _detect_format(upload, file_format)
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    rows = _iter_csv(stream) if file_format == "csv" else _iter_ndjson(stream)
+
+    report = ImportReport()
+    unique_column = getattr(model, unique_field)
+    seen_unique = set()
+    today = date.today()
+
+    def reject(line_number: int, errors: List[str]) -> None:
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(ImportRowError(row=line_number, errors=errors))
+        else:
+            report.errors_truncated = True
+
+    try:
+        while True:
+            chunk = list(islice(rows, CHUNK_SIZE))
+            if not chunk:
+                break
+            report.total_rows += len(chunk)
+
+            valid = []
+            for line_number, record, parse_error in chunk:
+                if parse_error:
+                    reject(line_number, [parse_error])
+                    continue
+                try:
+                    values = create_schema.model_validate(record).model_dump()
+                except ValidationError as exc:
+                    reject(line_number, _format_validation_error(exc))
+                    continue
+                valid.append((line_number, values))
+
+            # One chunk at a time under the write lock, so other writers interleave
+            async with write_lock:
+                # Unique IDs must not repeat within the file or clash with stored rows
+                keys = [values[unique_field] for _, values in valid if values[unique_field]]
+                existing = set()
+                if keys:
+                    result = await db.execute(select(unique_column).where(unique_column.in_(keys)))
+                    existing = set(result.scalars().all())
+
+                to_insert = []
+                deltas = Counter()
+                for line_number, values in valid:
+                    key = values[unique_field]
+                    if key and (key in existing or key in seen_unique):
+                        reject(line_number, [f"{unique_field}: {key!r} is already registered"])
+                        continue
+                    if key:
+                        seen_unique.add(key)
+                    values["created_at"] = today
+                    values["updated_at"] = today
+                    to_insert.append(values)
+                    deltas.update(stats_controller.counter_deltas(entity, None, values))
+
+                if to_insert:
+                    deltas[stats_controller.version_key(entity)] += 1
+                    await db.execute(insert(model), to_insert)
+                    await stats_controller.adjust_counters(db, deltas)
+                    await db.commit()
+                    report.inserted += len(to_insert)
+    except UnicodeDecodeError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded") from exc
+    except csv.Error as exc:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {exc}") from exc
+    finally:
+        stream.detach()
+
+    report.errors.sort(key=lambda error: error.row)
+    return report
+
+
+async def import_seniors(
+    db: AsyncSession,
+    upload: UploadFile,
+    file_format: Optional[str] = None
+) -> ImportReport:
+    """Bulk import senior citizens from a CSV or NDJSON upload."""
+    return await _import_records(
+        db, upload, file_format, Senior, SeniorCreate, "senior", "osca_id"
+    )
+
+
+async def import_pwds(
+    db: AsyncSession,
+    upload: UploadFile,
+    file_format: Optional[str] = None
+) -> ImportReport:
+    """Bulk import PWDs from a CSV or NDJSON upload."""
+    return await _import_records(
+        db, upload, file_format, PWD, PWDCreate, "pwd", "pwd_id"
+    )
@@ -1,37 +1,63 @@
 """PWD controller."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException
 
+from app.controllers import stats_controller
+from app.utils.cache import record_cache
+from app.utils.pagination import keyset_filter
+from app.utils.writer import single_writer
 from app.models.pwd import PWD, PWDCreate, PWDUpdate, PWDResponse
 
+# Sort key for list pages; the trailing id makes it unique for keyset cursors
+SORT_COLUMNS = (PWD.last_name, PWD.first_name, PWD.id)
 
+
+@single_writer
 async def create_pwd(db: AsyncSession, pwd: PWDCreate) -> PWDResponse:
     """Create a new PWD."""
     db_pwd = PWD(**pwd.model_dump())
     db.add(db_pwd)
+    await stats_controller.track_change(db, "pwd", None, db_pwd.model_dump())
     await db.commit()
     await db.refresh(db_pwd)
     return PWDResponse.model_validate(db_pwd)
 
 
-async def get_pwd(db: AsyncSession, pwd_id: int) -> Optional[PWDResponse]:
-    """Get a specific PWD by ID."""
+async def get_pwd(
+    db: AsyncSession,
+    pwd_id: int,
+    version: Optional[int] = None
+) -> Tuple[Optional[PWDResponse], Optional[int]]:
+    """Get a specific PWD by ID and the table version it was read at.
+
+    ``version`` comes from ``check_record_etag``; a cached PWD may have
+    been read at an older one. Without it the PWD is not cached.
+    """
+    cached = record_cache.get("pwd", pwd_id)
+    if cached is not None:
+        return cached
+
+    generation = record_cache.generation
     result = await db.execute(select(PWD).where(PWD.id == pwd_id))
     pwd = result.scalar_one_or_none()
-    return PWDResponse.model_validate(pwd) if pwd else None
+    if not pwd:
+        return None, version
 
+    response = PWDResponse.model_validate(pwd)
+    if version is not None:
+        record_cache.set("pwd", pwd_id, response, generation, version)
+    return response, version
 
-async def get_pwds(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+
+def list_query(
     barangay: Optional[str] = None,
     is_active: Optional[bool] = None
-) -> List[PWDResponse]:
-    """Get all PWDs with optional filtering."""
+):
+    """Build the filtered PWDs query shared by listing and export."""
     query = select(PWD)
     
     if barangay:
@@ -39,44 +65,80 @@ async def get_pwds(
     if is_active is not None:
         query = query.where(PWD.is_active == is_active)
     
-    query = query.offset(skip).limit(limit).order_by(PWD.last_name, PWD.first_name)
-    result = await db.execute(query)
-    pwds = result.scalars().all()
-    return [PWDResponse.model_validate(pwd) for pwd in pwds]
+    return query
+
+
+async def get_pwds(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    barangay: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    after: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Get all PWDs with optional filtering."""
+    query = list_query(barangay, is_active)
+    
+    if after:
+        query = query.where(keyset_filter(SORT_COLUMNS, after))
+    
+    query = query.order_by(*SORT_COLUMNS).offset(skip).limit(limit)
+    # Plain column rows need no per-row model validation; DB output is trusted
+    result = await db.execute(query.with_only_columns(*PWD.__table__.c))
+    columns = list(result.keys())
+    return [dict(zip(columns, row)) for row in result]
 
 
+@single_writer
 async def update_pwd(
     db: AsyncSession,
     pwd_id: int,
     pwd_update: PWDUpdate
 ) -> PWDResponse:
-    """Update a PWD."""
-    result = await db.execute(select(PWD).where(PWD.id == pwd_id))
-    pwd = result.scalar_one_or_none()
-    
-    if not pwd:
-        raise HTTPException(status_code=404, detail="PWD not found")
-    
+    """Update a PWD with a single UPDATE ... RETURNING."""
     update_data = pwd_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = date.today()
-    
-    for field, value in update_data.items():
-        setattr(pwd, field, value)
-    
+
+    old = None
+    if "is_active" in update_data:
+        # Counters need the previous is_active; read just that column
+        result = await db.execute(select(PWD.is_active).where(PWD.id == pwd_id))
+        old = result.mappings().one_or_none()
+
+    result = await db.execute(
+        update(PWD)
+        .where(PWD.id == pwd_id)
+        .values(**update_data)
+        .returning(*PWD.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    pwd = result.mappings().one_or_none()
+
+    if not pwd:
+        raise HTTPException(status_code=404, detail="PWD not found")
+
+    await stats_controller.track_change(db, "pwd", old if old is not None else pwd, pwd)
     await db.commit()
-    await db.refresh(pwd)
-    return PWDResponse.model_validate(pwd)
+    record_cache.invalidate("pwd", pwd_id)
+    return PWDResponse.model_validate(dict(pwd))
 
 
+@single_writer
 async def delete_pwd(db: AsyncSession, pwd_id: int) -> bool:
-    """Delete a PWD."""
-    result = await db.execute(select(PWD).where(PWD.id == pwd_id))
-    pwd = result.scalar_one_or_none()
-    
+    """Delete a PWD with a single DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(PWD)
+        .where(PWD.id == pwd_id)
+        .returning(PWD.is_active)
+        .execution_options(synchronize_session=False)
+    )
+    pwd = result.mappings().one_or_none()
+
     if not pwd:
         raise HTTPException(status_code=404, detail="PWD not found")
-    
-    await db.delete(pwd)
+
+    await stats_controller.track_change(db, "pwd", pwd, None)
     await db.commit()
+    record_cache.invalidate("pwd", pwd_id)
     return True
 
@@ -0,0 +1,158 @@
+"""Beneficiary full-text search controller.
+
+Searches the ``beneficiary_fts`` index maintained by triggers on the
+senior and pwd tables (see ``app/migrations.py``): an FTS5 table ranked
+with bm25 on SQLite, a tsvector table ranked with ts_rank on PostgreSQL.
+Either way a lower ``rank`` is a better match.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.controllers.beneficiary_controller import full_name
+from app.utils.dialect import dialect_name
+from app.models.pwd import PWD, PWDResponse
+from app.models.search import SearchResult
+from app.models.senior import Senior, SeniorResponse
+
+# FTS rowid parity of each beneficiary type
+ROWID_OFFSETS = {"senior": 0, "pwd": 1}
+
+# bm25 column weights in FTS column order: names and ID numbers rank highest
+BM25_WEIGHTS = "10.0, 4.0, 10.0, 1.0, 2.0, 8.0, 2.0, 0.5"
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query of quoted prefix terms."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def build_tsquery(q: str) -> Optional[str]:
+    """Turn free text into a PostgreSQL tsquery of prefix terms, all required."""
+    # Drop accents like the index does (see app.migrations.tsvector_sql)
+    plain = "".join(c for c in unicodedata.normalize("NFKD", q) if not unicodedata.combining(c))
+    terms = re.findall(r"\w+", plain.lower())
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+async def _ranked_ids(
+    db: AsyncSession,
+    q: str,
+    beneficiary_type: Optional[str],
+    limit: int,
+    barangay: Optional[str] = None,
+    is_active: Optional[bool] = None
+) -> List[Tuple[str, int, float]]:
+    """Return (beneficiary type, id, rank) of the best matches.
+
+    ``barangay`` and ``is_active`` filter through the beneficiary table, so
+    they need ``beneficiary_type``; the limit applies after filtering.
+    """
+    if dialect_name(db) == "postgresql":
+        match = build_tsquery(q)
+        sql = (
+            "SELECT beneficiary_fts.rowid, -ts_rank(beneficiary_fts.document, query) AS rank "
+            "FROM beneficiary_fts CROSS JOIN to_tsquery('simple', :match) AS query"
+        )
+        conditions = ["beneficiary_fts.document @@ query"]
+    else:
+        match = build_match_query(q)
+        sql = (
+            f"SELECT beneficiary_fts.rowid, bm25(beneficiary_fts, {BM25_WEIGHTS}) AS rank "
+            "FROM beneficiary_fts"
+        )
+        conditions = ["beneficiary_fts MATCH :match"]
+    if not match:
+        return []
+
+    params = {"match": match, "limit": limit}
+    if beneficiary_type:
+        conditions.append("beneficiary_fts.rowid % 2 = :parity")
+        params["parity"] = ROWID_OFFSETS[beneficiary_type]
+        if barangay is not None or is_active is not None:
+            sql += f" JOIN {beneficiary_type} AS person ON person.id = beneficiary_fts.rowid / 2"
+        if barangay is not None:
+            conditions.append("person.barangay = :barangay")
+            params["barangay"] = barangay
+        if is_active is not None:
+            conditions.append("person.is_active = :is_active")
+            params["is_active"] = is_active
+    sql += " WHERE " + " AND ".join(conditions) + " ORDER BY rank LIMIT :limit"
+
+    result = await db.execute(text(sql), params)
+    return [
+        ("pwd" if rowid % 2 else "senior", rowid // 2, rank)
+        for rowid, rank in result.all()
+    ]
+
+
+async def _load(db: AsyncSession, model, ids: List[int]) -> Dict[int, object]:
+    """Load rows of a beneficiary table by id."""
+    if not ids:
+        return {}
+    result = await db.execute(select(model).where(model.id.in_(ids)))
+    return {row.id: row for row in result.scalars().all()}
+
+
+async def search_beneficiaries(
+    db: AsyncSession,
+    q: str,
+    beneficiary_type: Optional[str] = None,
+    limit: int = 20
+) -> List[SearchResult]:
+    """Search seniors and PWDs by name, address, ID number, disability or notes."""
+    ranked = await _ranked_ids(db, q, beneficiary_type, limit)
+    seniors = await _load(db, Senior, [i for kind, i, _ in ranked if kind == "senior"])
+    pwds = await _load(db, PWD, [i for kind, i, _ in ranked if kind == "pwd"])
+
+    results = []
+    for kind, beneficiary_id, rank in ranked:
+        person = (seniors if kind == "senior" else pwds).get(beneficiary_id)
+        if person is None:
+            continue
+        results.append(SearchResult(
+            beneficiary_type=kind,
+            beneficiary_id=beneficiary_id,
+            full_name=full_name(person.last_name, person.first_name, person.middle_name),
+            barangay=person.barangay,
+            address=person.address,
+            id_number=person.osca_id if kind == "senior" else person.pwd_id,
+            disability_type=None if kind == "senior" else person.disability_type,
+            is_active=person.is_active,
+            rank=rank
+        ))
+    return results
+
+
+async def search_seniors(
+    db: AsyncSession,
+    q: str,
+    limit: int = 50,
+    barangay: Optional[str] = None,
+    is_active: Optional[bool] = None
+) -> List[SeniorResponse]:
+    """Search senior citizens, best matches first."""
+    ranked = await _ranked_ids(db, q, "senior", limit, barangay, is_active)
+    seniors = await _load(db, Senior, [i for _, i, _ in ranked])
+    return [SeniorResponse.model_validate(seniors[i]) for _, i, _ in ranked if i in seniors]
+
+
+async def search_pwds(
+    db: AsyncSession,
+    q: str,
+    limit: int = 50,
+    barangay: Optional[str] = None,
+    is_active: Optional[bool] = None
+) -> List[PWDResponse]:
+    """Search PWDs, best matches first."""
+    ranked = await _ranked_ids(db, q, "pwd", limit, barangay, is_active)
+    pwds = await _load(db, PWD, [i for _, i, _ in ranked])
+    return [PWDResponse.model_validate(pwds[i]) for _, i, _ in ranked if i in pwds]
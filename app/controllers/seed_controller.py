@@ -0,0 +1,364 @@
+"""Synthetic data generator for load testing.
+
+Generates Filipino-realistic seniors and PWDs and benefits, visits and
+assistance drives linked to them. Rows are built in chunks and written
+with one executemany INSERT and one commit per chunk, bypassing the
+per-row create path. The same ``seed`` always produces the same rows.
+
+Each chunk takes its ids inside its own transaction, after the rows
+already stored (from the id sequence on PostgreSQL), so seeding a
+database that is in use cannot collide with records created meanwhile.
+Benefits and visits link only to the generated seniors and PWDs.
+"""
+import asyncio
+import random
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import Date, DateTime, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers import stats_controller
+from app.migrations import CHANGE_LOG_TABLES, FTS_SOURCES, change_log_backfill_sql, fts_backfill_sql
+from app.models.assistance_drive import AssistanceDrive
+from app.models.benefit import Benefit
+from app.models.pwd import PWD
+from app.models.senior import Senior
+from app.models.visit import Visit
+from app.utils.dialect import begin_immediate, dialect_name
+from app.utils.writer import write_lock
+
+CHUNK_SIZE = 10000
+
+MALE_NAMES = [
+    "Jose", "Juan", "Antonio", "Pedro", "Ramon", "Ricardo", "Eduardo", "Rodrigo", "Ernesto", "Roberto",
+    "Manuel", "Fernando", "Danilo", "Rogelio", "Romeo", "Reynaldo", "Alfredo", "Carlos", "Mario", "Renato",
+    "Francisco", "Domingo", "Teodoro", "Bienvenido", "Rolando", "Jesus", "Efren", "Nestor", "Arnel", "Mark",
+]
+FEMALE_NAMES = [
+    "Maria", "Rosario", "Luzviminda", "Teresita", "Erlinda", "Corazon", "Remedios", "Lourdes", "Josefina", "Gloria",
+    "Carmelita", "Milagros", "Natividad", "Perla", "Rosalinda", "Leticia", "Zenaida", "Editha", "Imelda", "Virginia",
+    "Estrella", "Consolacion", "Norma", "Evangeline", "Marites", "Divina", "Aurora", "Angelica", "Kristine", "Jennifer",
+]
+SURNAMES = [
+    "Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Bautista", "Villanueva", "Ramos", "Aquino", "Castillo",
+    "Rivera", "Gonzales", "Flores", "Del Rosario", "De Leon", "Torres", "Cruz", "Lopez", "Fernandez", "Tolentino",
+    "Mercado", "Pascual", "Soriano", "Manalo", "Salazar", "Navarro", "Dizon", "Domingo", "Aguilar", "Panganiban",
+    "Magbanua", "Macaraeg", "Dimaculangan", "Sison", "Lacson", "Agustin", "Valdez", "Cabrera", "Evangelista", "Gatchalian",
+]
+BARANGAYS = [
+    "Poblacion", "San Isidro", "San Jose", "San Roque", "Santa Cruz", "San Antonio", "Santo Niño", "Bagong Silang",
+    "Malinis", "Maligaya", "San Vicente", "Mabini", "Rizal", "Bagumbayan", "San Miguel", "Santa Maria",
+    "Santo Tomas", "Del Pilar", "Magsaysay", "Burgos",
+]
+STREETS = ["Rizal St.", "Mabini St.", "Bonifacio St.", "Luna St.", "Quezon Ave.", "Burgos St.", "Del Pilar St."]
+MOBILE_PREFIXES = ["0917", "0918", "0919", "0927", "0928", "0939", "0945", "0947", "0955", "0977", "0998", "0999"]
+# Categories on the PWD ID (RA 10754 implementing rules), weighted by prevalence
+DISABILITY_TYPES = [
+    "Physical Disability (Orthopedic)", "Visual Disability", "Deaf or Hard of Hearing", "Psychosocial Disability",
+    "Intellectual Disability", "Learning Disability", "Speech and Language Impairment", "Mental Disability",
+    "Cancer (RA 11215)", "Rare Disease (RA 10747)",
+]
+DISABILITY_WEIGHTS = [30, 18, 12, 10, 9, 6, 6, 5, 3, 1]
+BENEFITS = [  # (benefit type, amount)
+    ("Social Pension", 3000.0), ("Rice Assistance", None), ("Food Pack", None), ("Medicine", 500.0),
+    ("Cash Gift", 1000.0), ("Birthday Cash Gift", 1000.0), ("Financial Assistance", 2000.0), ("Assistive Device", None),
+]
+VISIT_TYPES = ["checkup", "assessment", "assistance", "home visit", "follow-up"]
+VISITORS = ["BHW", "Barangay Nurse", "MSWDO", "OSCA Staff", "PDAO Staff"]
+DRIVES = [  # (drive type, name)
+    ("medical", "Libreng Konsulta"), ("medical", "Medical Mission"), ("food", "Food Pack Distribution"),
+    ("food", "Rice Distribution"), ("financial", "Social Pension Payout"), ("financial", "Ayuda Distribution"),
+]
+
+
+def _weighted(options: List[Any], weights: List[int]) -> List[Any]:
+    """Options repeated by weight, for uniform picking."""
+    return [option for option, weight in zip(options, weights) for _ in range(weight)]
+
+
+async def _allocate_ids(db: AsyncSession, model: type, count: int) -> Sequence[int]:
+    """Ids for ``count`` new rows, taken inside the transaction that inserts them."""
+    table = model.__tablename__
+    if dialect_name(db) == "postgresql":
+        # From the id sequence, like the create path; nobody else can insert
+        # while the chunk holds the table lock, so the ids are consecutive
+        result = await db.execute(
+            text(f"SELECT nextval(pg_get_serial_sequence('{table}', 'id')) FROM generate_series(1, :count) ORDER BY 1"),
+            {"count": count}
+        )
+        return result.scalars().all()
+    # Under BEGIN IMMEDIATE no other writer can take ids until the commit
+    result = await db.execute(select(func.max(model.id)))
+    start = result.scalar() or 0
+    return range(start + 1, start + count + 1)
+
+
+class _Generator:
+    """Row factories sharing one seeded RNG.
+
+    Values are produced ready for the driver (dates as ISO strings, the
+    format SQLAlchemy's SQLite types store) and picked with ``random()``
+    indexing, which is several times faster than ``Random.choice``.
+    """
+
+    def __init__(self, seed: int, today: date):
+        self.random = random.Random(seed).random
+        self.today = today.isoformat()
+        self.now = datetime.now().replace(microsecond=0).isoformat(" ", "microseconds")
+        # ISO date of each day from 90 days ahead to 101 years ago, by days ago
+        self.days = [(today - timedelta(days=days_ago)).isoformat() for days_ago in range(-90, 101 * 366)]
+        self.senior_ids: Sequence[int] = ()
+        self.pwd_ids: Sequence[int] = ()
+        self.senior_share = 0.0
+        self.disability_types = _weighted(DISABILITY_TYPES, DISABILITY_WEIGHTS)
+        self.benefit_statuses = _weighted(["distributed", "pending", "cancelled"], [17, 2, 1])
+        self.visit_statuses = _weighted(["completed", "cancelled", "rescheduled"], [17, 1, 2])
+        self.drive_statuses = _weighted(["completed", "ongoing", "cancelled"], [17, 2, 1])
+
+    def link_beneficiaries(self, senior_ids: Sequence[int], pwd_ids: Sequence[int]) -> None:
+        """Seniors and PWDs that generated benefits and visits belong to."""
+        self.senior_ids = senior_ids
+        self.pwd_ids = pwd_ids
+        self.senior_share = len(senior_ids) / (len(senior_ids) + len(pwd_ids) or 1)
+
+    def pick(self, options: Sequence[Any]) -> Any:
+        return options[int(self.random() * len(options))]
+
+    def between(self, low: int, high: int) -> int:
+        """Random integer in [low, high]."""
+        return low + int(self.random() * (high - low + 1))
+
+    def day(self, days_ago: int) -> str:
+        return self.days[days_ago + 90]
+
+    def person(self, record_id: int, min_age: int, max_age: int) -> Dict[str, Any]:
+        """Columns shared by seniors and PWDs; younger ages are more common."""
+        rand = self.random
+        male = rand() < 0.45
+        # Triangular distribution peaking at min_age
+        age_days = int(min_age * 365 + (max_age + 1 - min_age) * 365 * (1 - (1 - rand()) ** 0.5))
+        return {
+            "id": record_id,
+            "first_name": self.pick(MALE_NAMES if male else FEMALE_NAMES),
+            "middle_name": self.pick(SURNAMES) if rand() < 0.9 else None,
+            "last_name": self.pick(SURNAMES),
+            "birth_date": self.day(age_days),
+            "gender": "Male" if male else "Female",
+            "address": (
+                f"Purok {self.between(1, 7)}" if rand() < 0.6
+                else f"{self.between(1, 300)} {self.pick(STREETS)}"
+            ),
+            "barangay": self.pick(BARANGAYS),
+            "contact_number": (
+                f"{self.pick(MOBILE_PREFIXES)}{self.between(0, 9999999):07d}" if rand() < 0.7 else None
+            ),
+            "is_active": rand() < 0.93,
+            "notes": None,
+            "created_at": self.today,
+            "updated_at": self.today,
+        }
+
+    def senior(self, record_id: int) -> Dict[str, Any]:
+        return {**self.person(record_id, 60, 100), "osca_id": f"OSCA-{record_id:08d}"}
+
+    def pwd(self, record_id: int) -> Dict[str, Any]:
+        return {
+            **self.person(record_id, 1, 90),
+            "pwd_id": f"PWD-{record_id:08d}",
+            "disability_type": self.pick(self.disability_types),
+        }
+
+    def beneficiary(self) -> Dict[str, Any]:
+        if self.random() < self.senior_share:
+            return {"beneficiary_type": "senior", "beneficiary_id": self.pick(self.senior_ids)}
+        return {"beneficiary_type": "pwd", "beneficiary_id": self.pick(self.pwd_ids)}
+
+    def benefit(self, record_id: int) -> Dict[str, Any]:
+        benefit_type, amount = self.pick(BENEFITS)
+        days_ago = self.between(-30, 730)
+        return {
+            "id": record_id,
+            **self.beneficiary(),
+            "benefit_type": benefit_type,
+            "amount": amount,
+            "description": None,
+            "distribution_date": self.day(days_ago),
+            "distributed_by": self.pick(VISITORS),
+            # Future distributions are still pending; most past ones went out
+            "status": "pending" if days_ago < 0 else self.pick(self.benefit_statuses),
+            "created_at": self.today,
+            "updated_at": self.today,
+        }
+
+    def visit(self, record_id: int) -> Dict[str, Any]:
+        days_ago = self.between(-60, 730)
+        return {
+            "id": record_id,
+            **self.beneficiary(),
+            "visit_date": self.day(days_ago),
+            "visit_time": f"{self.between(8, 16):02d}:{self.pick(('00', '30'))}",
+            "visit_type": self.pick(VISIT_TYPES),
+            "purpose": None,
+            "visited_by": self.pick(VISITORS),
+            "status": "scheduled" if days_ago < 0 else self.pick(self.visit_statuses),
+            "notes": None,
+            "created_at": self.now,
+            "updated_at": self.now,
+        }
+
+    def drive(self, record_id: int) -> Dict[str, Any]:
+        drive_type, name = self.pick(DRIVES)
+        days_ago = self.between(-60, 730)
+        barangay = self.pick(BARANGAYS)
+        return {
+            "id": record_id,
+            "drive_name": f"{name} - {barangay} {self.day(days_ago)[:7]}",
+            "drive_type": drive_type,
+            "target_beneficiaries": self.pick(("senior", "pwd", "both")),
+            "start_date": self.day(days_ago),
+            "end_date": self.day(days_ago - self.between(0, 3)),
+            "location": f"Barangay {barangay} Covered Court",
+            "description": None,
+            "organizer": self.pick(("LGU", "MSWDO", "OSCA", "PDAO", "DSWD")),
+            "status": "planned" if days_ago < 0 else self.pick(self.drive_statuses),
+            "participants_count": 0 if days_ago < 0 else self.between(20, 500),
+            "created_at": self.today,
+            "updated_at": self.today,
+        }
+
+
+def _driver_converter(column_type: Any) -> Optional[Callable[[str], Any]]:
+    """Parser turning a generated ISO string into the value asyncpg binds for a column."""
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column_type, Date):
+        return date.fromisoformat
+    return None
+
+
+async def _insert_chunks(
+    db: AsyncSession,
+    model: type,
+    count: int,
+    make_row: Callable[[int], Dict[str, Any]],
+    chunk_size: int
+) -> Sequence[int]:
+    """Insert ``count`` generated rows, one transaction per chunk, and return their ids.
+
+    Rows go straight to the driver as tuples; SQLAlchemy's per-row
+    parameter processing would otherwise cost as much as the insert.
+    Per-row triggers (the search index of seniors and PWDs, the change
+    log of every table) cost more than the insert itself, so they are
+    switched off, the chunk is indexed and logged with one INSERT ...
+    SELECT each and the triggers are switched back on, all in the chunk's
+    transaction: an error or an interrupted run rolls the triggers back in
+    with the rows.
+    """
+    ids = array("q")
+    if not count:
+        return ids
+    table = model.__tablename__
+    columns = list(make_row(1))
+    dialect = dialect_name(db)
+    if dialect == "postgresql":
+        converters = [_driver_converter(model.__table__.c[column].type) for column in columns]
+        placeholders = ", ".join(f"${number}" for number in range(1, len(columns) + 1))
+    else:
+        converters = None
+        placeholders = ", ".join("?" * len(columns))
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    # Per-row triggers to switch off, by (PostgreSQL trigger, SQLite insert
+    # trigger), with the statements doing their work for a whole chunk;
+    # each is completed with "BETWEEN <first id> AND <last id>"
+    entity = {logged: name for name, logged in CHANGE_LOG_TABLES.items()}[table]
+    bulk_triggers = {
+        (f"{table}_change_log", f"{table}_change_log_insert"): [
+            # A reused id may still have a tombstone; the new row replaces it
+            f"DELETE FROM change_log WHERE entity = '{entity}' AND entity_id",
+            f"{change_log_backfill_sql(dialect, entity)} WHERE id",
+        ],
+    }
+    if table in FTS_SOURCES:
+        bulk_triggers[(f"{table}_fts_sync", f"{table}_fts_insert")] = [f"{fts_backfill_sql(dialect, table)} WHERE id"]
+
+    switches = []  # (disable, enable) statement pairs
+    for pg_trigger, sqlite_trigger in bulk_triggers:
+        if dialect == "postgresql":
+            switches.append((
+                f"ALTER TABLE {table} DISABLE TRIGGER {pg_trigger}",
+                f"ALTER TABLE {table} ENABLE TRIGGER {pg_trigger}"
+            ))
+        else:
+            conn = await db.connection()
+            result = await conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (sqlite_trigger,)
+            )
+            switches.append((f"DROP TRIGGER {sqlite_trigger}", result.scalar()))
+
+    async def insert_chunk(size: int) -> Sequence[int]:
+        async with write_lock:
+            try:
+                await begin_immediate(db)
+                conn = await db.connection()
+                # On PostgreSQL this also locks the table until the commit
+                for disable, _ in switches:
+                    await conn.exec_driver_sql(disable)
+                chunk_ids = await _allocate_ids(db, model, size)
+                rows = [tuple(make_row(record_id).values()) for record_id in chunk_ids]
+                if converters:
+                    rows = [
+                        tuple(convert(value) if convert and value is not None else value
+                              for convert, value in zip(converters, row))
+                        for row in rows
+                    ]
+                await conn.exec_driver_sql(insert_sql, rows)
+                for statements in bulk_triggers.values():
+                    for statement in statements:
+                        await conn.exec_driver_sql(f"{statement} BETWEEN {chunk_ids[0]} AND {chunk_ids[-1]}")
+                for _, enable in switches:
+                    await conn.exec_driver_sql(enable)
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+        return chunk_ids
+
+    for start in range(0, count, chunk_size):
+        # An interrupted run (Ctrl-C) stops after the chunk in flight:
+        # asyncpg cancelled in the middle of an executemany waits forever
+        # for the server, which is still waiting for the rest of the rows
+        chunk = asyncio.ensure_future(insert_chunk(min(chunk_size, count - start)))
+        try:
+            ids.extend(await asyncio.shield(chunk))
+        except asyncio.CancelledError:
+            await asyncio.wait([chunk])
+            raise
+    return ids
+
+
+async def seed_database(
+    db: AsyncSession,
+    seniors: int,
+    pwds: int,
+    benefits: int,
+    visits: int,
+    drives: int,
+    seed: int = 42,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    """Generate and insert records, then rebuild the dashboard counters."""
+    generator = _Generator(seed, date.today())
+
+    senior_ids = await _insert_chunks(db, Senior, seniors, generator.senior, chunk_size)
+    pwd_ids = await _insert_chunks(db, PWD, pwds, generator.pwd, chunk_size)
+    generator.link_beneficiaries(senior_ids, pwd_ids)
+    if not seniors + pwds:
+        benefits = visits = 0  # nobody to link them to
+    await _insert_chunks(db, Benefit, benefits, generator.benefit, chunk_size)
+    await _insert_chunks(db, Visit, visits, generator.visit, chunk_size)
+    await _insert_chunks(db, AssistanceDrive, drives, generator.drive, chunk_size)
+
+    await stats_controller.rebuild_counters(db)
+    return {"seniors": seniors, "pwds": pwds, "benefits": benefits, "visits": visits, "drives": drives}
@@ -1,37 +1,63 @@
 """Senior Citizen controller."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException
 
+from app.controllers import stats_controller
+from app.utils.cache import record_cache
+from app.utils.pagination import keyset_filter
+from app.utils.writer import single_writer
 from app.models.senior import Senior, SeniorCreate, SeniorUpdate, SeniorResponse
 
+# Sort key for list pages; the trailing id makes it unique for keyset cursors
+SORT_COLUMNS = (Senior.last_name, Senior.first_name, Senior.id)
 
+
+@single_writer
 async def create_senior(db: AsyncSession, senior: SeniorCreate) -> SeniorResponse:
     """Create a new senior citizen."""
     db_senior = Senior(**senior.model_dump())
     db.add(db_senior)
+    await stats_controller.track_change(db, "senior", None, db_senior.model_dump())
     await db.commit()
     await db.refresh(db_senior)
     return SeniorResponse.model_validate(db_senior)
 
 
-async def get_senior(db: AsyncSession, senior_id: int) -> Optional[SeniorResponse]:
-    """Get a specific senior citizen by ID."""
+async def get_senior(
+    db: AsyncSession,
+    senior_id: int,
+    version: Optional[int] = None
+) -> Tuple[Optional[SeniorResponse], Optional[int]]:
+    """Get a specific senior citizen by ID and the table version it was read at.
+
+    ``version`` comes from ``check_record_etag``; a cached senior citizen may have
+    been read at an older one. Without it the senior citizen is not cached.
+    """
+    cached = record_cache.get("senior", senior_id)
+    if cached is not None:
+        return cached
+
+    generation = record_cache.generation
     result = await db.execute(select(Senior).where(Senior.id == senior_id))
     senior = result.scalar_one_or_none()
-    return SeniorResponse.model_validate(senior) if senior else None
+    if not senior:
+        return None, version
 
+    response = SeniorResponse.model_validate(senior)
+    if version is not None:
+        record_cache.set("senior", senior_id, response, generation, version)
+    return response, version
 
-async def get_seniors(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+
+def list_query(
     barangay: Optional[str] = None,
     is_active: Optional[bool] = None
-) -> List[SeniorResponse]:
-    """Get all senior citizens with optional filtering."""
+):
+    """Build the filtered senior citizens query shared by listing and export."""
     query = select(Senior)
     
     if barangay:
@@ -39,44 +65,80 @@ async def get_seniors(
     if is_active is not None:
         query = query.where(Senior.is_active == is_active)
     
-    query = query.offset(skip).limit(limit).order_by(Senior.last_name, Senior.first_name)
-    result = await db.execute(query)
-    seniors = result.scalars().all()
-    return [SeniorResponse.model_validate(senior) for senior in seniors]
+    return query
+
+
+async def get_seniors(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    barangay: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    after: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Get all senior citizens with optional filtering."""
+    query = list_query(barangay, is_active)
+    
+    if after:
+        query = query.where(keyset_filter(SORT_COLUMNS, after))
+    
+    query = query.order_by(*SORT_COLUMNS).offset(skip).limit(limit)
+    # Plain column rows need no per-row model validation; DB output is trusted
+    result = await db.execute(query.with_only_columns(*Senior.__table__.c))
+    columns = list(result.keys())
+    return [dict(zip(columns, row)) for row in result]
 
 
+@single_writer
 async def update_senior(
     db: AsyncSession,
     senior_id: int,
     senior_update: SeniorUpdate
 ) -> SeniorResponse:
-    """Update a senior citizen."""
-    result = await db.execute(select(Senior).where(Senior.id == senior_id))
-    senior = result.scalar_one_or_none()
-    
-    if not senior:
-        raise HTTPException(status_code=404, detail="Senior citizen not found")
-    
+    """Update a senior citizen with a single UPDATE ... RETURNING."""
     update_data = senior_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = date.today()
-    
-    for field, value in update_data.items():
-        setattr(senior, field, value)
-    
+
+    old = None
+    if "is_active" in update_data:
+        # Counters need the previous is_active; read just that column
+        result = await db.execute(select(Senior.is_active).where(Senior.id == senior_id))
+        old = result.mappings().one_or_none()
+
+    result = await db.execute(
+        update(Senior)
+        .where(Senior.id == senior_id)
+        .values(**update_data)
+        .returning(*Senior.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    senior = result.mappings().one_or_none()
+
+    if not senior:
+        raise HTTPException(status_code=404, detail="Senior citizen not found")
+
+    await stats_controller.track_change(db, "senior", old if old is not None else senior, senior)
     await db.commit()
-    await db.refresh(senior)
-    return SeniorResponse.model_validate(senior)
+    record_cache.invalidate("senior", senior_id)
+    return SeniorResponse.model_validate(dict(senior))
 
 
+@single_writer
 async def delete_senior(db: AsyncSession, senior_id: int) -> bool:
-    """Delete a senior citizen."""
-    result = await db.execute(select(Senior).where(Senior.id == senior_id))
-    senior = result.scalar_one_or_none()
-    
+    """Delete a senior citizen with a single DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(Senior)
+        .where(Senior.id == senior_id)
+        .returning(Senior.is_active)
+        .execution_options(synchronize_session=False)
+    )
+    senior = result.mappings().one_or_none()
+
     if not senior:
         raise HTTPException(status_code=404, detail="Senior citizen not found")
-    
-    await db.delete(senior)
+
+    await stats_controller.track_change(db, "senior", senior, None)
     await db.commit()
+    record_cache.invalidate("senior", senior_id)
     return True
 
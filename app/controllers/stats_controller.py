@@ -0,0 +1,169 @@
+"""Dashboard statistics controller.
+
+Dashboard numbers are read from the ``stats_counters`` table, which every
+create/update/delete adjusts inside its own transaction through
+``track_change``. ``rebuild_counters`` recomputes the table from scratch
+with GROUP BY queries to fix any drift.
+
+The same table holds a ``{entity}.version`` counter per table, bumped by
+every write, which conditional GETs use to build ETags without reading
+any rows.
+It also holds the delta sync purge point, ``change_log.purged_seq`` (see
+``sync_controller``).
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models import Senior, PWD, Benefit, Visit, AssistanceDrive
+from app.models.stats import DashboardStats, StatsCounter
+from app.utils.dialect import upsert
+from app.utils.writer import single_writer
+
+# Column each entity is broken down by in the counters table
+COUNTED_COLUMNS = {
+    "senior": Senior.is_active,
+    "pwd": PWD.is_active,
+    "benefit": Benefit.status,
+    "visit": Visit.status,
+    "assistance_drive": AssistanceDrive.status,
+}
+
+
+def _breakdown_key(entity: str, value: Any) -> Optional[str]:
+    """Counter name for a value of the entity's counted column."""
+    if entity in ("senior", "pwd"):
+        return f"{entity}.active" if value else None
+    return f"{entity}.status.{value}"
+
+
+def version_key(entity: str) -> str:
+    """Counter name of an entity's change version."""
+    return f"{entity}.version"
+
+
+def counter_keys(entity: str, row: Optional[Mapping[str, Any]]) -> List[str]:
+    """Counter names a single row contributes to."""
+    if row is None:
+        return []
+    keys = [f"{entity}.total"]
+    breakdown = _breakdown_key(entity, row[COUNTED_COLUMNS[entity].key])
+    if breakdown:
+        keys.append(breakdown)
+    return keys
+
+
+def counter_deltas(
+    entity: str,
+    old: Optional[Mapping[str, Any]],
+    new: Optional[Mapping[str, Any]]
+) -> Counter:
+    """Counter adjustments for a row moving from ``old`` to ``new`` state."""
+    deltas = Counter(counter_keys(entity, new))
+    deltas.subtract(counter_keys(entity, old))
+    return deltas
+
+
+async def adjust_counters(db: AsyncSession, deltas: Mapping[str, int]) -> None:
+    """Apply counter adjustments in the session's current transaction."""
+    # In name order, so concurrent PostgreSQL writers lock counter rows in
+    # the same order and cannot deadlock
+    params = [{"name": name, "value": value} for name, value in sorted(deltas.items()) if value]
+    if not params:
+        return
+    stmt = upsert(db, StatsCounter)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StatsCounter.name],
+        set_={"value": StatsCounter.value + stmt.excluded.value}
+    )
+    await db.execute(stmt, params)
+
+
+async def track_change(
+    db: AsyncSession,
+    entity: str,
+    old: Optional[Mapping[str, Any]],
+    new: Optional[Mapping[str, Any]]
+) -> None:
+    """Record a create (old=None), update, or delete (new=None) of one row."""
+    deltas = counter_deltas(entity, old, new)
+    deltas[version_key(entity)] += 1
+    await adjust_counters(db, deltas)
+
+
+async def count_counters(db: AsyncSession) -> Dict[str, int]:
+    """Compute every counter from the tables with GROUP BY queries."""
+    counters: Dict[str, int] = {}
+    for entity, column in COUNTED_COLUMNS.items():
+        result = await db.execute(select(column, func.count()).group_by(column))
+        for value, count in result.all():
+            counters[f"{entity}.total"] = counters.get(f"{entity}.total", 0) + count
+            key = _breakdown_key(entity, value)
+            if key:
+                counters[key] = counters.get(key, 0) + count
+    return counters
+
+
+@single_writer
+async def rebuild_counters(db: AsyncSession) -> DashboardStats:
+    """Rebuild the counters table from scratch.
+
+    Versions are kept and bumped rather than reset, so ETags handed out
+    before the rebuild can never match again.
+    """
+    counters = await count_counters(db)
+    # Versions and the change log's purge point are not counts; keep them
+    await db.execute(delete(StatsCounter).where(
+        StatsCounter.name.not_like("%.version"), StatsCounter.name.not_like("change_log.%")
+    ))
+    if counters:
+        # An upsert, so a rebuild running concurrently on PostgreSQL (which
+        # has no write lock) overwrites rather than duplicates counters
+        stmt = upsert(db, StatsCounter)
+        await db.execute(
+            stmt.on_conflict_do_update(index_elements=[StatsCounter.name], set_={"value": stmt.excluded.value}),
+            [{"name": name, "value": value} for name, value in sorted(counters.items())]
+        )
+    await adjust_counters(db, {version_key(entity): 1 for entity in COUNTED_COLUMNS})
+    await db.commit()
+    return _to_dashboard_stats(counters)
+
+
+async def counters_empty(db: AsyncSession) -> bool:
+    """Check whether the counters table has never been populated."""
+    result = await db.execute(select(StatsCounter.name).limit(1))
+    return result.first() is None
+
+
+def _to_dashboard_stats(counters: Mapping[str, int]) -> DashboardStats:
+    """Map counter names to dashboard fields."""
+    return DashboardStats(
+        total_seniors=counters.get("senior.total", 0),
+        active_seniors=counters.get("senior.active", 0),
+        total_pwds=counters.get("pwd.total", 0),
+        active_pwds=counters.get("pwd.active", 0),
+        total_benefits=counters.get("benefit.total", 0),
+        pending_benefits=counters.get("benefit.status.pending", 0),
+        total_visits=counters.get("visit.total", 0),
+        scheduled_visits=counters.get("visit.status.scheduled", 0),
+        total_drives=counters.get("assistance_drive.total", 0),
+        ongoing_drives=counters.get("assistance_drive.status.ongoing", 0)
+    )
+
+
+async def get_versions(db: AsyncSession, entities: Iterable[str]) -> Dict[str, int]:
+    """Current change version of each entity's table."""
+    keys = {version_key(entity): entity for entity in entities}
+    result = await db.execute(
+        select(StatsCounter.name, StatsCounter.value).where(StatsCounter.name.in_(keys))
+    )
+    found = dict(result.all())
+    return {entity: found.get(key, 0) for key, entity in keys.items()}
+
+
+async def get_dashboard_stats(db: AsyncSession) -> DashboardStats:
+    """Get every dashboard number from the counters table."""
+    result = await db.execute(select(StatsCounter.name, StatsCounter.value))
+    return _to_dashboard_stats(dict(result.all()))
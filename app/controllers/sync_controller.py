@@ -0,0 +1,129 @@
+"""Delta sync controller for offline clients.
+
+Triggers on the five registry tables (see ``app/migrations.py``) keep one
+``change_log`` entry per row: every insert, update or delete replaces the
+row's entry with one at the next sequence number, and a delete leaves a
+tombstone. The changes after sync point ``since`` are the entries above
+it, one per row however often the row changed, so a client that was
+offline for a week downloads only what changed that week.
+
+Tombstones older than a cut-off are dropped by ``compact_change_log``. A
+client whose sync point is older than the newest dropped tombstone could
+miss deletes, so it is sent a ``reset`` batch starting over from 0.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+from sqlalchemy import delete, func, text, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.controllers import stats_controller
+from app.models import Senior, PWD, Benefit, Visit, AssistanceDrive
+from app.models.stats import StatsCounter
+from app.models.sync import ChangeLog
+from app.utils.dialect import dialect_name
+from app.utils.writer import single_writer
+
+ENTITY_MODELS = {
+    "senior": Senior,
+    "pwd": PWD,
+    "benefit": Benefit,
+    "visit": Visit,
+    "assistance_drive": AssistanceDrive,
+}
+
+# Counter holding the sequence number of the newest tombstone compacted away
+PURGED_SEQ_KEY = "change_log.purged_seq"
+
+
+async def _purged_seq(db: AsyncSession) -> int:
+    result = await db.execute(select(StatsCounter.value).where(StatsCounter.name == PURGED_SEQ_KEY))
+    return result.scalar() or 0
+
+
+async def get_changes(db: AsyncSession, since: int, limit: int = 500) -> Dict[str, Any]:
+    """Rows inserted, updated or deleted after sync point ``since``, oldest change first.
+
+    Returns a dict in the shape of ``SyncBatch``. Upserts are plain column
+    rows, as in the list endpoints.
+    """
+    postgresql = dialect_name(db) == "postgresql"
+    if postgresql:
+        # Sequence numbers are drawn before commit, so a concurrent writer
+        # could still commit one below the entries read here and the client
+        # would skip it. SHARE mode waits for transactions already writing
+        # the log and holds off new ones, so it is only held while the
+        # entry list is read.
+        await db.execute(text("LOCK TABLE change_log IN SHARE MODE"))
+
+    purged = await _purged_seq(db)
+    result = await db.execute(select(func.max(ChangeLog.seq)))
+    last = max(result.scalar() or 0, purged)
+    # A sync point beyond the log means the database was replaced since
+    reset = 0 < since < purged or since > last
+    if reset:
+        since = 0
+
+    result = await db.execute(
+        select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.deleted)
+        .where(ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    )
+    entries = result.all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if postgresql:
+        # Release the lock before loading rows. They are then at least as
+        # new as their entries, and a row deleted in between is left out
+        # here and sent as a tombstone in a later batch.
+        await db.commit()
+
+    upserts: Dict[str, List[int]] = defaultdict(list)
+    deletes: Dict[str, List[int]] = defaultdict(list)
+    for _, entity, entity_id, deleted in entries:
+        (deletes if deleted else upserts)[entity].append(entity_id)
+
+    changes: Dict[str, Dict[str, list]] = {}
+    for entity, model in ENTITY_MODELS.items():
+        rows: List[Dict[str, Any]] = []
+        if upserts[entity]:
+            result = await db.execute(
+                select(*model.__table__.c).where(model.id.in_(upserts[entity])).order_by(model.id)
+            )
+            columns = list(result.keys())
+            rows = [dict(zip(columns, row)) for row in result]
+        if rows or deletes[entity]:
+            changes[entity] = {"upserts": rows, "deletes": deletes[entity]}
+
+    return {
+        "since": since,
+        "next": entries[-1].seq if entries else since,
+        "has_more": has_more,
+        "reset": reset,
+        "changes": changes,
+    }
+
+
+@single_writer
+async def compact_change_log(db: AsyncSession, older_than: datetime) -> int:
+    """Drop tombstones logged before ``older_than`` and return how many.
+
+    Clients that last synced before a dropped tombstone get a reset batch
+    and download everything again.
+    """
+    condition = (ChangeLog.deleted == true()) & (ChangeLog.changed_at < older_than)
+    result = await db.execute(select(func.max(ChangeLog.seq)).where(condition))
+    newest = result.scalar()
+    if newest is None:
+        return 0
+
+    result = await db.execute(
+        delete(ChangeLog).where(condition, ChangeLog.seq <= newest)
+    )
+    purged = await _purged_seq(db)
+    if newest > purged:
+        await stats_controller.adjust_counters(db, {PURGED_SEQ_KEY: newest - purged})
+    await db.commit()
+    return result.rowcount
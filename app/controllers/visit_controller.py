@@ -1,38 +1,81 @@
 """Visit controller."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException
 
+from app.controllers import beneficiary_controller, stats_controller
+from app.utils.cache import record_cache
+from app.utils.group_commit import group_commit
+from app.utils.pagination import keyset_filter
+from app.utils.writer import single_writer
 from app.models.visit import Visit, VisitCreate, VisitUpdate, VisitResponse
 
+# Sort key for list pages; the trailing id makes it unique for keyset cursors
+SORT_COLUMNS = (Visit.visit_date, Visit.id)
 
-async def create_visit(db: AsyncSession, visit: VisitCreate) -> VisitResponse:
-    """Create a new visit."""
+
+async def _stage_visit(db: AsyncSession, visit: VisitCreate) -> VisitResponse:
+    """Add a new visit to the session's transaction without committing."""
     db_visit = Visit(**visit.model_dump())
     db.add(db_visit)
-    await db.commit()
-    await db.refresh(db_visit)
+    await stats_controller.track_change(db, "visit", None, db_visit.model_dump())
+    await db.flush()
     return VisitResponse.model_validate(db_visit)
 
 
-async def get_visit(db: AsyncSession, visit_id: int) -> Optional[VisitResponse]:
-    """Get a specific visit by ID."""
+async def create_visit(db: AsyncSession, visit: VisitCreate) -> VisitResponse:
+    """Create a new visit.
+
+    With group commit on, the insert is committed together with other
+    creates arriving at the same time instead of in ``db``.
+    """
+    if group_commit.enabled:
+        return await group_commit.submit(_stage_visit, visit)
+    return await _create_visit(db, visit)
+
+
+@single_writer
+async def _create_visit(db: AsyncSession, visit: VisitCreate) -> VisitResponse:
+    response = await _stage_visit(db, visit)
+    await db.commit()
+    return response
+
+
+async def get_visit(
+    db: AsyncSession,
+    visit_id: int,
+    version: Optional[int] = None
+) -> Tuple[Optional[VisitResponse], Optional[int]]:
+    """Get a specific visit by ID and the table version it was read at.
+
+    ``version`` comes from ``check_record_etag``; a cached visit may have
+    been read at an older one. Without it the visit is not cached.
+    """
+    cached = record_cache.get("visit", visit_id)
+    if cached is not None:
+        return cached
+
+    generation = record_cache.generation
     result = await db.execute(select(Visit).where(Visit.id == visit_id))
     visit = result.scalar_one_or_none()
-    return VisitResponse.model_validate(visit) if visit else None
+    if not visit:
+        return None, version
 
+    response = VisitResponse.model_validate(visit)
+    if version is not None:
+        record_cache.set("visit", visit_id, response, generation, version)
+    return response, version
 
-async def get_visits(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+
+def list_query(
     beneficiary_type: Optional[str] = None,
     beneficiary_id: Optional[int] = None,
     status: Optional[str] = None
-) -> List[VisitResponse]:
-    """Get all visits with optional filtering."""
+):
+    """Build the filtered visits query shared by listing and export."""
     query = select(Visit)
     
     if beneficiary_type:
@@ -42,44 +85,89 @@ async def get_visits(
     if status:
         query = query.where(Visit.status == status)
     
-    query = query.offset(skip).limit(limit).order_by(Visit.visit_date.desc())
-    result = await db.execute(query)
-    visits = result.scalars().all()
-    return [VisitResponse.model_validate(visit) for visit in visits]
+    return query
 
 
+async def get_visits(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    beneficiary_type: Optional[str] = None,
+    beneficiary_id: Optional[int] = None,
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    expand_beneficiary: bool = False
+) -> List[Dict[str, Any]]:
+    """Get all visits with optional filtering.
+
+    With ``expand_beneficiary`` each row also gets a ``beneficiary``
+    summary, resolved for the whole page in one query per beneficiary table.
+    """
+    query = list_query(beneficiary_type, beneficiary_id, status)
+    
+    if after:
+        query = query.where(keyset_filter(SORT_COLUMNS, after, descending=True))
+    
+    query = query.order_by(*(column.desc() for column in SORT_COLUMNS)).offset(skip).limit(limit)
+    # Plain column rows need no per-row model validation; DB output is trusted
+    result = await db.execute(query.with_only_columns(*Visit.__table__.c))
+    columns = list(result.keys())
+    rows = [dict(zip(columns, row)) for row in result]
+    if expand_beneficiary:
+        await beneficiary_controller.attach_beneficiaries(db, rows)
+    return rows
+
+
+@single_writer
 async def update_visit(
     db: AsyncSession,
     visit_id: int,
     visit_update: VisitUpdate
 ) -> VisitResponse:
-    """Update a visit."""
-    result = await db.execute(select(Visit).where(Visit.id == visit_id))
-    visit = result.scalar_one_or_none()
-    
-    if not visit:
-        raise HTTPException(status_code=404, detail="Visit not found")
-    
+    """Update a visit with a single UPDATE ... RETURNING."""
     update_data = visit_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now()
-    
-    for field, value in update_data.items():
-        setattr(visit, field, value)
-    
+
+    old = None
+    if "status" in update_data:
+        # Counters need the previous status; read just that column
+        result = await db.execute(select(Visit.status).where(Visit.id == visit_id))
+        old = result.mappings().one_or_none()
+
+    result = await db.execute(
+        update(Visit)
+        .where(Visit.id == visit_id)
+        .values(**update_data)
+        .returning(*Visit.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    visit = result.mappings().one_or_none()
+
+    if not visit:
+        raise HTTPException(status_code=404, detail="Visit not found")
+
+    await stats_controller.track_change(db, "visit", old if old is not None else visit, visit)
     await db.commit()
-    await db.refresh(visit)
-    return VisitResponse.model_validate(visit)
+    record_cache.invalidate("visit", visit_id)
+    return VisitResponse.model_validate(dict(visit))
 
 
+@single_writer
 async def delete_visit(db: AsyncSession, visit_id: int) -> bool:
-    """Delete a visit."""
-    result = await db.execute(select(Visit).where(Visit.id == visit_id))
-    visit = result.scalar_one_or_none()
-    
+    """Delete a visit with a single DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(Visit)
+        .where(Visit.id == visit_id)
+        .returning(Visit.status)
+        .execution_options(synchronize_session=False)
+    )
+    visit = result.mappings().one_or_none()
+
     if not visit:
         raise HTTPException(status_code=404, detail="Visit not found")
-    
-    await db.delete(visit)
+
+    await stats_controller.track_change(db, "visit", visit, None)
     await db.commit()
+    record_cache.invalidate("visit", visit_id)
     return True
 
@@ -0,0 +1,236 @@
+"""Versioned schema migrations.
+
+``SQLModel.metadata.create_all`` only creates missing tables, so changes to
+existing tables (such as new indexes) are applied here. Each migration runs
+once, in version order, and is recorded in the ``schema_migrations`` table.
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Connection
+
+from app.models import Senior, PWD, Benefit, Visit, AssistanceDrive
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    """A single schema migration."""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _create_model_indexes(conn: Connection) -> None:
+    """Create the secondary indexes declared on the table models."""
+    for model in (Senior, PWD, Benefit, Visit, AssistanceDrive):
+        for index in model.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# Full-text index over seniors and PWDs. The FTS rowid encodes the source
+# row as id * 2 for seniors and id * 2 + 1 for PWDs, so triggers can update
+# an entry with a rowid lookup instead of scanning the index.
+FTS_COLUMNS = (
+    "first_name", "middle_name", "last_name", "address",
+    "barangay", "id_number", "disability_type", "notes"
+)
+FTS_SOURCES = {
+    # table: (rowid offset, source column for each FTS column)
+    "senior": (0, ("first_name", "middle_name", "last_name", "address",
+                   "barangay", "osca_id", None, "notes")),
+    "pwd": (1, ("first_name", "middle_name", "last_name", "address",
+                "barangay", "pwd_id", "disability_type", "notes")),
+}
+
+
+# PostgreSQL ranks with ts_rank over a weighted tsvector instead of bm25;
+# the weight class of each FTS column mirrors the search controller's bm25
+# weights (names and ID numbers highest).
+TSVECTOR_WEIGHTS = ("A", "B", "A", "D", "C", "A", "C", "D")
+# Accents folded before indexing, as FTS5's remove_diacritics does (the
+# unaccent extension is not installed everywhere)
+ACCENTED = "áàâäãéèêëíìîïóòôöõúùûüñçÁÀÂÄÃÉÈÊËÍÌÎÏÓÒÔÖÕÚÙÛÜÑÇ"
+UNACCENTED = "aaaaaeeeeiiiiooooouuuuncAAAAAEEEEIIIIOOOOOUUUUNC"
+
+
+def fts_source_sql(table: str, prefix: str = "") -> str:
+    """FTS5 column values of a beneficiary row; ``prefix`` is ``"new."`` inside triggers."""
+    _, sources = FTS_SOURCES[table]
+    values = [f"{prefix}{source}" if source else "NULL" for source in sources]
+    return ", ".join(values)
+
+
+def tsvector_sql(table: str, prefix: str = "") -> str:
+    """Weighted tsvector of a beneficiary row for the PostgreSQL search index."""
+    _, sources = FTS_SOURCES[table]
+    return " || ".join(
+        # Punctuation splits words as in FTS5, so "OSCA-00000012" indexes "osca" and "00000012"
+        f"setweight(to_tsvector('simple', regexp_replace(translate(coalesce({prefix}{source}, ''), "
+        f"'{ACCENTED}', '{UNACCENTED}'), '[^[:alnum:]]+', ' ', 'g')), '{weight}')"
+        for source, weight in zip(sources, TSVECTOR_WEIGHTS) if source
+    )
+
+
+def fts_backfill_sql(dialect: str, table: str) -> str:
+    """INSERT ... SELECT indexing rows of ``table``; append a WHERE to limit it."""
+    offset, _ = FTS_SOURCES[table]
+    if dialect == "postgresql":
+        return (
+            f"INSERT INTO beneficiary_fts(rowid, document) "
+            f"SELECT id * 2 + {offset}, {tsvector_sql(table)} FROM {table}"
+        )
+    return (
+        f"INSERT INTO beneficiary_fts(rowid, {', '.join(FTS_COLUMNS)}) "
+        f"SELECT id * 2 + {offset}, {fts_source_sql(table)} FROM {table}"
+    )
+
+
+def _create_beneficiary_fts(conn: Connection) -> None:
+    """Create the full-text search index, its sync triggers, and backfill it."""
+    if conn.dialect.name == "postgresql":
+        _create_beneficiary_tsvector(conn)
+        return
+    columns = ", ".join(FTS_COLUMNS)
+    conn.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS beneficiary_fts USING fts5("
+        f"{columns}, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for table, (offset, sources) in FTS_SOURCES.items():
+        watched = ", ".join(source for source in sources if source)
+        insert_new = (
+            f"INSERT INTO beneficiary_fts(rowid, {columns}) "
+            f"VALUES (new.id * 2 + {offset}, {fts_source_sql(table, 'new.')});"
+        )
+        delete_old = f"DELETE FROM beneficiary_fts WHERE rowid = old.id * 2 + {offset};"
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END"
+        )
+        conn.exec_driver_sql(fts_backfill_sql("sqlite", table))
+
+
+def _create_beneficiary_tsvector(conn: Connection) -> None:
+    """PostgreSQL search index: a GIN-indexed tsvector per row, kept by one trigger per table."""
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS beneficiary_fts (rowid BIGINT PRIMARY KEY, document TSVECTOR NOT NULL)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_beneficiary_fts_document ON beneficiary_fts USING GIN (document)"
+    )
+    for table, (offset, sources) in FTS_SOURCES.items():
+        watched = ", ".join(source for source in sources if source)
+        conn.exec_driver_sql(
+            f"CREATE OR REPLACE FUNCTION {table}_fts_sync() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP <> 'INSERT' THEN DELETE FROM beneficiary_fts WHERE rowid = OLD.id * 2 + {offset}; END IF; "
+            f"IF TG_OP <> 'DELETE' THEN INSERT INTO beneficiary_fts(rowid, document) "
+            f"VALUES (NEW.id * 2 + {offset}, {tsvector_sql(table, 'NEW.')}); END IF; "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        )
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_fts_sync ON {table}")
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER {table}_fts_sync AFTER INSERT OR DELETE OR UPDATE OF {watched} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_fts_sync()"
+        )
+        conn.exec_driver_sql(fts_backfill_sql("postgresql", table))
+
+
+# Change log for delta sync (see app/controllers/sync_controller.py). Every
+# insert, update or delete of a registry row replaces the row's change_log
+# entry with one at the next sequence number; deletes leave a tombstone.
+CHANGE_LOG_TABLES = {
+    # entity: table
+    "senior": Senior.__tablename__,
+    "pwd": PWD.__tablename__,
+    "benefit": Benefit.__tablename__,
+    "visit": Visit.__tablename__,
+    "assistance_drive": AssistanceDrive.__tablename__,
+}
+# Local time, like the datetime.now() timestamps the application writes
+CHANGE_LOG_NOW = {"sqlite": "datetime('now', 'localtime')", "postgresql": "LOCALTIMESTAMP"}
+
+
+def change_log_backfill_sql(dialect: str, entity: str) -> str:
+    """INSERT ... SELECT logging rows of an entity as changed; append a WHERE to limit it."""
+    return (
+        f"INSERT INTO change_log(entity, entity_id, deleted, changed_at) "
+        f"SELECT '{entity}', id, FALSE, {CHANGE_LOG_NOW[dialect]} FROM {CHANGE_LOG_TABLES[entity]}"
+    )
+
+
+def _create_change_log(conn: Connection) -> None:
+    """Create the change log triggers and log every existing row."""
+    if conn.dialect.name == "postgresql":
+        _create_change_log_function(conn)
+    for entity, table in CHANGE_LOG_TABLES.items():
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_change_log ON {table}")
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER {table}_change_log AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION change_log_sync('{entity}')"
+            )
+        else:
+            for event, row, deleted in (("insert", "new", "FALSE"), ("update", "new", "FALSE"),
+                                        ("delete", "old", "TRUE")):
+                conn.exec_driver_sql(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_change_log_{event} AFTER {event.upper()} ON {table} BEGIN "
+                    f"DELETE FROM change_log WHERE entity = '{entity}' AND entity_id = {row}.id; "
+                    f"INSERT INTO change_log(entity, entity_id, deleted, changed_at) "
+                    f"VALUES ('{entity}', {row}.id, {deleted}, {CHANGE_LOG_NOW['sqlite']}); END"
+                )
+        conn.exec_driver_sql(change_log_backfill_sql(conn.dialect.name, entity))
+
+
+def _create_change_log_function(conn: Connection) -> None:
+    """PostgreSQL trigger function shared by all tables; the entity name is its argument."""
+    conn.exec_driver_sql(
+        "CREATE OR REPLACE FUNCTION change_log_sync() RETURNS trigger AS $$ "
+        "DECLARE row_id INTEGER := CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END; BEGIN "
+        "DELETE FROM change_log WHERE entity = TG_ARGV[0] AND entity_id = row_id; "
+        "INSERT INTO change_log(entity, entity_id, deleted, changed_at) "
+        f"VALUES (TG_ARGV[0], row_id, TG_OP = 'DELETE', {CHANGE_LOG_NOW['postgresql']}); "
+        "RETURN NULL; END $$ LANGUAGE plpgsql"
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Secondary indexes for list filters and sort order", _create_model_indexes),
+    Migration(2, "Full-text search index over seniors and PWDs", _create_beneficiary_fts),
+    Migration(3, "Birth date indexes for duplicate detection", _create_model_indexes),
+    Migration(4, "Change log for delta sync", _create_change_log),
+]
+
+
+def run_migrations(conn: Connection) -> List[int]:
+    """Apply pending migrations and return the versions applied."""
+    migration_metadata.create_all(conn)
+    applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    newly_applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        migration.apply(conn)
+        conn.execute(schema_migrations.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=datetime.now()
+        ))
+        newly_applied.append(migration.version)
+    return newly_applied
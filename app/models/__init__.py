@@ -4,6 +4,8 @@ from app.models.pwd import PWD
 from app.models.benefit import Benefit
 from app.models.visit import Visit
 from app.models.assistance_drive import AssistanceDrive
+from app.models.stats import StatsCounter
+from app.models.sync import ChangeLog
 
-__all__ = ["Senior", "PWD", "Benefit", "Visit", "AssistanceDrive"]
+__all__ = ["Senior", "PWD", "Benefit", "Visit", "AssistanceDrive", "StatsCounter", "ChangeLog"]
 
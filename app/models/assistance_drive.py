@@ -1,6 +1,7 @@
 """Assistance Drive model."""
 from datetime import date
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -20,6 +21,12 @@ class AssistanceDriveBase(SQLModel):
 
 class AssistanceDrive(AssistanceDriveBase, table=True):
     """Assistance Drive database model."""
+    __table_args__ = (
+        Index("ix_assistancedrive_start_date", "start_date"),
+        Index("ix_assistancedrive_status_start", "status", "start_date"),
+        Index("ix_assistancedrive_target_start", "target_beneficiaries", "start_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: Optional[date] = Field(default_factory=date.today)
     updated_at: Optional[date] = Field(default_factory=date.today)
@@ -50,3 +57,25 @@ class AssistanceDriveResponse(AssistanceDriveBase):
     created_at: date
     updated_at: date
 
+
+
+class AssistanceDriveDistribution(SQLModel):
+    """Schema for generating benefits for every eligible beneficiary of a drive."""
+    benefit_type: str = Field(..., max_length=100)
+    amount: Optional[float] = None
+    description: Optional[str] = Field(None, max_length=500)
+    distribution_date: Optional[date] = None  # defaults to the drive's start date
+    distributed_by: Optional[str] = Field(None, max_length=100)  # defaults to the organizer
+    status: str = Field(default="pending", max_length=20)
+    barangay: Optional[str] = None
+    gender: Optional[str] = None
+    born_on_or_before: Optional[date] = None
+    disability_type: Optional[str] = None  # only applies to PWDs
+
+
+class AssistanceDriveDistributionResult(SQLModel):
+    """Schema for bulk benefit distribution response."""
+    drive: AssistanceDriveResponse
+    seniors: int = 0
+    pwds: int = 0
+    benefits_created: int = 0
@@ -0,0 +1,10 @@
+"""Beneficiary summary model."""
+from sqlmodel import SQLModel
+
+
+class BeneficiarySummary(SQLModel):
+    """Schema for the senior or PWD a benefit or visit belongs to."""
+    id: int
+    full_name: str
+    barangay: str
+    is_active: bool
@@ -1,8 +1,11 @@
 """Benefit distribution model."""
 from datetime import date
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
+from app.models.beneficiary import BeneficiarySummary
+
 
 class BenefitBase(SQLModel):
     """Base model for Benefit."""
@@ -18,6 +21,12 @@ class BenefitBase(SQLModel):
 
 class Benefit(BenefitBase, table=True):
     """Benefit database model."""
+    __table_args__ = (
+        Index("ix_benefit_beneficiary_date", "beneficiary_type", "beneficiary_id", "distribution_date"),
+        Index("ix_benefit_status_date", "status", "distribution_date"),
+        Index("ix_benefit_distribution_date", "distribution_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: Optional[date] = Field(default_factory=date.today)
     updated_at: Optional[date] = Field(default_factory=date.today)
@@ -44,3 +53,7 @@ class BenefitResponse(BenefitBase):
     created_at: date
     updated_at: date
 
+
+class BenefitWithBeneficiary(BenefitResponse):
+    """Schema for a Benefit list row with ``expand=beneficiary``."""
+    beneficiary: Optional[BeneficiarySummary] = None  # None if the beneficiary was deleted
@@ -0,0 +1,14 @@
+"""Duplicate registration candidate model."""
+from typing import List
+from sqlmodel import SQLModel
+
+
+class DuplicateCandidate(SQLModel):
+    """Schema for a suggested merge of two registrations of the same person."""
+    beneficiary_type: str  # "senior" or "pwd"
+    keep_id: int
+    duplicate_id: int
+    keep_name: str
+    duplicate_name: str
+    score: float
+    reasons: List[str]
@@ -0,0 +1,18 @@
+"""Bulk import report model."""
+from typing import List
+from sqlmodel import SQLModel, Field
+
+
+class ImportRowError(SQLModel):
+    """Schema for a rejected row in a bulk import."""
+    row: int  # line number in the uploaded file
+    errors: List[str]
+
+
+class ImportReport(SQLModel):
+    """Schema for bulk import response."""
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = Field(default_factory=list)
+    errors_truncated: bool = False
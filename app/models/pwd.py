@@ -1,6 +1,7 @@
 """Person with Disability model."""
 from datetime import date
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -22,6 +23,13 @@ class PWDBase(SQLModel):
 
 class PWD(PWDBase, table=True):
     """Person with Disability database model."""
+    __table_args__ = (
+        Index("ix_pwd_name", "last_name", "first_name"),
+        Index("ix_pwd_barangay_name", "barangay", "last_name", "first_name"),
+        Index("ix_pwd_active_name", "is_active", "last_name", "first_name"),
+        Index("ix_pwd_birth_date", "birth_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: Optional[date] = Field(default_factory=date.today)
     updated_at: Optional[date] = Field(default_factory=date.today)
@@ -0,0 +1,16 @@
+"""Beneficiary search result model."""
+from typing import Optional
+from sqlmodel import SQLModel
+
+
+class SearchResult(SQLModel):
+    """Schema for a ranked beneficiary search hit."""
+    beneficiary_type: str  # "senior" or "pwd"
+    beneficiary_id: int
+    full_name: str
+    barangay: str
+    address: str
+    id_number: Optional[str] = None  # OSCA ID or PWD ID
+    disability_type: Optional[str] = None
+    is_active: bool
+    rank: float
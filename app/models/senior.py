@@ -1,6 +1,7 @@
 """Senior Citizen model."""
 from datetime import date
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -21,6 +22,13 @@ class SeniorBase(SQLModel):
 
 class Senior(SeniorBase, table=True):
     """Senior Citizen database model."""
+    __table_args__ = (
+        Index("ix_senior_name", "last_name", "first_name"),
+        Index("ix_senior_barangay_name", "barangay", "last_name", "first_name"),
+        Index("ix_senior_active_name", "is_active", "last_name", "first_name"),
+        Index("ix_senior_birth_date", "birth_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: Optional[date] = Field(default_factory=date.today)
     updated_at: Optional[date] = Field(default_factory=date.today)
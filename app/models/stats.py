@@ -0,0 +1,37 @@
+"""Dashboard statistics model."""
+from sqlmodel import SQLModel, Field
+
+
+class DashboardStats(SQLModel):
+    """Schema for dashboard statistics response."""
+    total_seniors: int = 0
+    active_seniors: int = 0
+    total_pwds: int = 0
+    active_pwds: int = 0
+    total_benefits: int = 0
+    pending_benefits: int = 0
+    total_visits: int = 0
+    scheduled_visits: int = 0
+    total_drives: int = 0
+    ongoing_drives: int = 0
+
+
+class CacheStats(SQLModel):
+    """Schema for record cache counters."""
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class StatsCounter(SQLModel, table=True):
+    """Incrementally maintained counter database model."""
+    __tablename__ = "stats_counters"
+
+    name: str = Field(primary_key=True, max_length=100)  # e.g. "benefit.status.pending"
+    value: int = Field(default=0)
@@ -0,0 +1,36 @@
+"""Delta sync models."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class ChangeLog(SQLModel, table=True):
+    """Latest change of one registry row, maintained by triggers."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", name="uq_change_log_entity"),
+        # Never reuse the sequence number of a replaced entry
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    entity: str = Field(max_length=20)  # "senior", "pwd", "benefit", "visit" or "assistance_drive"
+    entity_id: int
+    deleted: bool = Field(default=False)  # a tombstone
+    changed_at: datetime = Field(default_factory=datetime.now)
+
+
+class EntityChanges(SQLModel):
+    """Schema for the changed rows of one entity in a sync batch."""
+    upserts: List[Dict[str, Any]] = []  # full rows, inserted or updated
+    deletes: List[int] = []  # ids of deleted rows
+
+
+class SyncBatch(SQLModel):
+    """Schema for a batch of changes after a sync point."""
+    since: int  # sync point the batch starts after (0 when reset)
+    next: int  # pass as ``since`` to get the following batch
+    has_more: bool
+    reset: bool = False  # the client's copy cannot be updated; replace it with this batch and the ones after
+    changes: Dict[str, EntityChanges] = {}
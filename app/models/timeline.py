@@ -0,0 +1,16 @@
+"""Beneficiary timeline model."""
+from datetime import date
+from typing import Optional
+from sqlmodel import SQLModel
+
+
+class TimelineEntry(SQLModel):
+    """Schema for one benefit or visit in a beneficiary's history."""
+    kind: str  # "benefit" or "visit"
+    id: int  # benefit or visit id
+    date: date  # distribution or visit date
+    category: str  # benefit_type or visit_type
+    status: str
+    amount: Optional[float] = None  # benefits only
+    handled_by: Optional[str] = None  # distributed_by or visited_by
+    details: Optional[str] = None  # description or purpose
@@ -1,8 +1,11 @@
 """Visit scheduling model."""
 from datetime import date, datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
+from app.models.beneficiary import BeneficiarySummary
+
 
 class VisitBase(SQLModel):
     """Base model for Visit."""
@@ -19,6 +22,12 @@ class VisitBase(SQLModel):
 
 class Visit(VisitBase, table=True):
     """Visit database model."""
+    __table_args__ = (
+        Index("ix_visit_beneficiary_date", "beneficiary_type", "beneficiary_id", "visit_date"),
+        Index("ix_visit_status_date", "status", "visit_date"),
+        Index("ix_visit_visit_date", "visit_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: Optional[datetime] = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = Field(default_factory=datetime.now)
@@ -46,3 +55,7 @@ class VisitResponse(VisitBase):
     created_at: datetime
     updated_at: datetime
 
+
+class VisitWithBeneficiary(VisitResponse):
+    """Schema for a Visit list row with ``expand=beneficiary``."""
+    beneficiary: Optional[BeneficiarySummary] = None  # None if the beneficiary was deleted
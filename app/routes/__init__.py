@@ -4,6 +4,11 @@ from app.routes import pwd_routes
 from app.routes import benefit_routes
 from app.routes import visit_routes
 from app.routes import assistance_drive_routes
+from app.routes import stats_routes
+from app.routes import search_routes
+from app.routes import dedup_routes
+from app.routes import metrics_routes
+from app.routes import sync_routes
 from app.routes import web_routes
 
 __all__ = [
@@ -12,5 +17,10 @@ __all__ = [
     "benefit_routes",
     "visit_routes",
     "assistance_drive_routes",
+    "stats_routes",
+    "search_routes",
+    "dedup_routes",
+    "metrics_routes",
+    "sync_routes",
     "web_routes"
 ]
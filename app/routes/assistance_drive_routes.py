@@ -1,14 +1,19 @@
 """Assistance Drive routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.controllers import assistance_drive_controller
+from app.database import get_db, get_read_db, read_session
+from app.utils.etag import check_etag, check_record_etag, etag_headers, record_etag
+from app.utils.pagination import next_cursor
+from app.controllers import assistance_drive_controller, export_controller
 from app.models.assistance_drive import (
     AssistanceDriveCreate,
     AssistanceDriveUpdate,
-    AssistanceDriveResponse
+    AssistanceDriveResponse,
+    AssistanceDriveDistribution,
+    AssistanceDriveDistributionResult
 )
 
 router = APIRouter(prefix="/api/assistance-drives", tags=["assistance-drives"])
@@ -25,28 +30,52 @@ async def create_assistance_drive(
 
 @router.get("", response_model=List[AssistanceDriveResponse])
 async def get_assistance_drives(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
     target_beneficiaries: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
-) -> List[AssistanceDriveResponse]:
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
     """Get all assistance drives."""
-    return await assistance_drive_controller.get_assistance_drives(
-        db, skip, limit, status, target_beneficiaries
+    etag = await check_etag(request, db, ["assistance_drive"])
+    drives = await assistance_drive_controller.get_assistance_drives(
+        db, skip, limit, status, target_beneficiaries, after
     )
+    headers = etag_headers(etag)
+    cursor = next_cursor(drives, limit, assistance_drive_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(drives, headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_assistance_drives(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = Query(None),
+    target_beneficiaries: Optional[str] = Query(None)
+) -> StreamingResponse:
+    """Stream all matching assistance drives as CSV or NDJSON."""
+    query = assistance_drive_controller.list_query(status, target_beneficiaries).order_by(*assistance_drive_controller.SORT_COLUMNS)
+    return export_controller.export_response(read_session, query, format, "assistance-drives")
 
 
 @router.get("/{drive_id}", response_model=AssistanceDriveResponse)
 async def get_assistance_drive(
+    request: Request,
+    response: Response,
     drive_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> AssistanceDriveResponse:
     """Get a specific assistance drive."""
-    drive = await assistance_drive_controller.get_assistance_drive(db, drive_id)
+    version = await check_record_etag(request, db, "assistance_drive")
+    drive, version = await assistance_drive_controller.get_assistance_drive(db, drive_id, version)
     if not drive:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Assistance drive not found")
+    response.headers.update(etag_headers(record_etag(request, "assistance_drive", version)))
     return drive
 
 
@@ -69,3 +98,13 @@ async def delete_assistance_drive(
     await assistance_drive_controller.delete_assistance_drive(db, drive_id)
     return None
 
+
+
+@router.post("/{drive_id}/distribute", response_model=AssistanceDriveDistributionResult)
+async def distribute_benefits(
+    drive_id: int,
+    distribution: AssistanceDriveDistribution,
+    db: AsyncSession = Depends(get_db)
+) -> AssistanceDriveDistributionResult:
+    """Create benefits for every eligible beneficiary of an assistance drive."""
+    return await assistance_drive_controller.distribute_benefits(db, drive_id, distribution)
@@ -1,11 +1,14 @@
 """Benefit routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.controllers import benefit_controller
-from app.models.benefit import BenefitCreate, BenefitUpdate, BenefitResponse
+from app.database import get_db, get_read_db, read_session
+from app.utils.etag import check_etag, check_record_etag, etag_headers, record_etag
+from app.utils.pagination import next_cursor
+from app.controllers import benefit_controller, export_controller
+from app.models.benefit import BenefitCreate, BenefitUpdate, BenefitResponse, BenefitWithBeneficiary
 
 router = APIRouter(prefix="/api/benefits", tags=["benefits"])
 
@@ -19,31 +22,61 @@ async def create_benefit(
     return await benefit_controller.create_benefit(db, benefit)
 
 
-@router.get("", response_model=List[BenefitResponse])
+@router.get("", response_model=List[BenefitWithBeneficiary])
 async def get_benefits(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     beneficiary_type: Optional[str] = Query(None),
     beneficiary_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
-) -> List[BenefitResponse]:
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    expand: Optional[str] = Query(
+        None, pattern="^beneficiary$", description="'beneficiary' adds each row's beneficiary name and barangay"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
     """Get all benefits."""
-    return await benefit_controller.get_benefits(
-        db, skip, limit, beneficiary_type, beneficiary_id, status
+    expand_beneficiary = expand == "beneficiary"
+    # Expanded rows also change when a senior or PWD is renamed
+    etag = await check_etag(request, db, ["benefit", "senior", "pwd"] if expand_beneficiary else ["benefit"])
+    benefits = await benefit_controller.get_benefits(
+        db, skip, limit, beneficiary_type, beneficiary_id, status, after, expand_beneficiary
     )
+    headers = etag_headers(etag)
+    cursor = next_cursor(benefits, limit, benefit_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(benefits, headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_benefits(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    beneficiary_type: Optional[str] = Query(None),
+    beneficiary_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None)
+) -> StreamingResponse:
+    """Stream all matching benefits as CSV or NDJSON."""
+    query = benefit_controller.list_query(beneficiary_type, beneficiary_id, status).order_by(*benefit_controller.SORT_COLUMNS)
+    return export_controller.export_response(read_session, query, format, "benefits")
 
 
 @router.get("/{benefit_id}", response_model=BenefitResponse)
 async def get_benefit(
+    request: Request,
+    response: Response,
     benefit_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> BenefitResponse:
     """Get a specific benefit."""
-    benefit = await benefit_controller.get_benefit(db, benefit_id)
+    version = await check_record_etag(request, db, "benefit")
+    benefit, version = await benefit_controller.get_benefit(db, benefit_id, version)
     if not benefit:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Benefit not found")
+    response.headers.update(etag_headers(record_etag(request, "benefit", version)))
     return benefit
 
 
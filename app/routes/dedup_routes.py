@@ -0,0 +1,22 @@
+"""Duplicate registration routes."""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.controllers import dedup_controller
+from app.models.duplicate import DuplicateCandidate
+
+router = APIRouter(prefix="/api/duplicates", tags=["duplicates"])
+
+
+@router.get("", response_model=List[DuplicateCandidate])
+async def find_duplicates(
+    type: str = Query("senior", pattern="^(senior|pwd)$"),
+    barangay: Optional[str] = Query(None),
+    min_score: float = Query(dedup_controller.DEFAULT_MIN_SCORE, ge=0, le=1),
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_read_db)
+) -> List[DuplicateCandidate]:
+    """Suggest merges for likely duplicate senior or PWD registrations."""
+    return await dedup_controller.find_duplicates(db, type, barangay, min_score, limit)
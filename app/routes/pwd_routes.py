@@ -1,11 +1,16 @@
 """PWD routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.controllers import pwd_controller
+from app.database import get_db, get_read_db, read_session
+from app.utils.etag import check_etag, check_record_etag, etag_headers, record_etag
+from app.utils.pagination import next_cursor
+from app.controllers import pwd_controller, import_controller, export_controller, dedup_controller, timeline_controller
+from app.models.import_report import ImportReport
 from app.models.pwd import PWDCreate, PWDUpdate, PWDResponse
+from app.models.timeline import TimelineEntry
 
 router = APIRouter(prefix="/api/pwds", tags=["pwds"])
 
@@ -13,37 +18,101 @@ router = APIRouter(prefix="/api/pwds", tags=["pwds"])
 @router.post("", response_model=PWDResponse, status_code=201)
 async def create_pwd(
     pwd: PWDCreate,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ) -> PWDResponse:
-    """Create a new PWD."""
-    return await pwd_controller.create_pwd(db, pwd)
+    """Create a new PWD.
+
+    Likely duplicate registrations are listed in the X-Possible-Duplicates header.
+    """
+    duplicates = await dedup_controller.find_matches(db, "pwd", pwd)
+    created = await pwd_controller.create_pwd(db, pwd)
+    if duplicates:
+        response.headers["X-Possible-Duplicates"] = ",".join(str(i) for i in duplicates)
+    return created
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_pwds(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db)
+) -> ImportReport:
+    """Bulk import PWDs from a CSV or NDJSON file."""
+    return await import_controller.import_pwds(db, file, format)
 
 
 @router.get("", response_model=List[PWDResponse])
 async def get_pwds(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     barangay: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
-    db: AsyncSession = Depends(get_db)
-) -> List[PWDResponse]:
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
     """Get all PWDs."""
-    return await pwd_controller.get_pwds(db, skip, limit, barangay, is_active)
+    etag = await check_etag(request, db, ["pwd"])
+    pwds = await pwd_controller.get_pwds(db, skip, limit, barangay, is_active, after)
+    headers = etag_headers(etag)
+    cursor = next_cursor(pwds, limit, pwd_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(pwds, headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_pwds(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    barangay: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None)
+) -> StreamingResponse:
+    """Stream all matching PWDs as CSV or NDJSON."""
+    query = pwd_controller.list_query(barangay, is_active).order_by(*pwd_controller.SORT_COLUMNS)
+    return export_controller.export_response(read_session, query, format, "pwds")
 
 
 @router.get("/{pwd_id}", response_model=PWDResponse)
 async def get_pwd(
+    request: Request,
+    response: Response,
     pwd_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> PWDResponse:
     """Get a specific PWD."""
-    pwd = await pwd_controller.get_pwd(db, pwd_id)
+    version = await check_record_etag(request, db, "pwd")
+    pwd, version = await pwd_controller.get_pwd(db, pwd_id, version)
     if not pwd:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="PWD not found")
+    response.headers.update(etag_headers(record_etag(request, "pwd", version)))
     return pwd
 
 
+@router.get("/{pwd_id}/timeline", response_model=List[TimelineEntry])
+async def get_pwd_timeline(
+    request: Request,
+    pwd_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
+    """Benefits and visits of a PWD, newest first."""
+    etag = await check_etag(request, db, ["pwd", "benefit", "visit"])
+    pwd, _ = await pwd_controller.get_pwd(db, pwd_id)
+    if not pwd:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="PWD not found")
+    entries = await timeline_controller.get_timeline(db, "pwd", pwd_id, limit, after)
+    headers = etag_headers(etag)
+    cursor = next_cursor(entries, limit, timeline_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    return ORJSONResponse(entries, headers=headers)
+
+
 @router.put("/{pwd_id}", response_model=PWDResponse)
 async def update_pwd(
     pwd_id: int,
@@ -0,0 +1,21 @@
+"""Beneficiary search routes."""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.controllers import search_controller
+from app.models.search import SearchResult
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(senior|pwd)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+) -> List[SearchResult]:
+    """Search seniors and PWDs, best matches first."""
+    return await search_controller.search_beneficiaries(db, q, type, limit)
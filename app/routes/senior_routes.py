@@ -1,11 +1,16 @@
 """Senior Citizen routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.controllers import senior_controller
+from app.database import get_db, get_read_db, read_session
+from app.utils.etag import check_etag, check_record_etag, etag_headers, record_etag
+from app.utils.pagination import next_cursor
+from app.controllers import senior_controller, import_controller, export_controller, dedup_controller, timeline_controller
+from app.models.import_report import ImportReport
 from app.models.senior import SeniorCreate, SeniorUpdate, SeniorResponse
+from app.models.timeline import TimelineEntry
 
 router = APIRouter(prefix="/api/seniors", tags=["seniors"])
 
@@ -13,37 +18,101 @@ router = APIRouter(prefix="/api/seniors", tags=["seniors"])
 @router.post("", response_model=SeniorResponse, status_code=201)
 async def create_senior(
     senior: SeniorCreate,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ) -> SeniorResponse:
-    """Create a new senior citizen."""
-    return await senior_controller.create_senior(db, senior)
+    """Create a new senior citizen.
+
+    Likely duplicate registrations are listed in the X-Possible-Duplicates header.
+    """
+    duplicates = await dedup_controller.find_matches(db, "senior", senior)
+    created = await senior_controller.create_senior(db, senior)
+    if duplicates:
+        response.headers["X-Possible-Duplicates"] = ",".join(str(i) for i in duplicates)
+    return created
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_seniors(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db)
+) -> ImportReport:
+    """Bulk import senior citizens from a CSV or NDJSON file."""
+    return await import_controller.import_seniors(db, file, format)
 
 
 @router.get("", response_model=List[SeniorResponse])
 async def get_seniors(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     barangay: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
-    db: AsyncSession = Depends(get_db)
-) -> List[SeniorResponse]:
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
     """Get all senior citizens."""
-    return await senior_controller.get_seniors(db, skip, limit, barangay, is_active)
+    etag = await check_etag(request, db, ["senior"])
+    seniors = await senior_controller.get_seniors(db, skip, limit, barangay, is_active, after)
+    headers = etag_headers(etag)
+    cursor = next_cursor(seniors, limit, senior_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(seniors, headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_seniors(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    barangay: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None)
+) -> StreamingResponse:
+    """Stream all matching senior citizens as CSV or NDJSON."""
+    query = senior_controller.list_query(barangay, is_active).order_by(*senior_controller.SORT_COLUMNS)
+    return export_controller.export_response(read_session, query, format, "seniors")
 
 
 @router.get("/{senior_id}", response_model=SeniorResponse)
 async def get_senior(
+    request: Request,
+    response: Response,
     senior_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> SeniorResponse:
     """Get a specific senior citizen."""
-    senior = await senior_controller.get_senior(db, senior_id)
+    version = await check_record_etag(request, db, "senior")
+    senior, version = await senior_controller.get_senior(db, senior_id, version)
     if not senior:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Senior citizen not found")
+    response.headers.update(etag_headers(record_etag(request, "senior", version)))
     return senior
 
 
+@router.get("/{senior_id}/timeline", response_model=List[TimelineEntry])
+async def get_senior_timeline(
+    request: Request,
+    senior_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
+    """Benefits and visits of a senior citizen, newest first."""
+    etag = await check_etag(request, db, ["senior", "benefit", "visit"])
+    senior, _ = await senior_controller.get_senior(db, senior_id)
+    if not senior:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="Senior citizen not found")
+    entries = await timeline_controller.get_timeline(db, "senior", senior_id, limit, after)
+    headers = etag_headers(etag)
+    cursor = next_cursor(entries, limit, timeline_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    return ORJSONResponse(entries, headers=headers)
+
+
 @router.put("/{senior_id}", response_model=SeniorResponse)
 async def update_senior(
     senior_id: int,
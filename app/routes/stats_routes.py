@@ -0,0 +1,35 @@
+"""Dashboard statistics routes."""
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.utils.cache import record_cache
+from app.utils.etag import check_etag, etag_headers
+from app.controllers import stats_controller
+from app.models.stats import CacheStats, DashboardStats
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("", response_model=DashboardStats)
+async def get_stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+) -> DashboardStats:
+    """Get dashboard statistics."""
+    etag = await check_etag(request, db, stats_controller.COUNTED_COLUMNS)
+    response.headers.update(etag_headers(etag))
+    return await stats_controller.get_dashboard_stats(db)
+
+
+@router.post("/rebuild", response_model=DashboardStats)
+async def rebuild_stats(db: AsyncSession = Depends(get_db)) -> DashboardStats:
+    """Rebuild the dashboard counters from scratch."""
+    return await stats_controller.rebuild_counters(db)
+
+
+@router.get("/cache", response_model=CacheStats)
+async def get_cache_stats() -> CacheStats:
+    """Get hit, miss and eviction counters of the single-record cache."""
+    return CacheStats(**record_cache.stats())
@@ -0,0 +1,22 @@
+"""Delta sync routes for offline field tablets."""
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.controllers import sync_controller
+from app.models.sync import SyncBatch
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+
+@router.get("/changes", response_model=SyncBatch)
+async def get_changes(
+    since: int = Query(0, ge=0, description="The 'next' value of the previous batch; 0 downloads everything"),
+    limit: int = Query(500, ge=1, le=5000, description="Most changed rows per batch"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
+    """Get the rows inserted, updated or deleted since a sync point."""
+    batch = await sync_controller.get_changes(db, since, limit)
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(batch)
@@ -1,11 +1,14 @@
 """Visit routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.controllers import visit_controller
-from app.models.visit import VisitCreate, VisitUpdate, VisitResponse
+from app.database import get_db, get_read_db, read_session
+from app.utils.etag import check_etag, check_record_etag, etag_headers, record_etag
+from app.utils.pagination import next_cursor
+from app.controllers import visit_controller, export_controller
+from app.models.visit import VisitCreate, VisitUpdate, VisitResponse, VisitWithBeneficiary
 
 router = APIRouter(prefix="/api/visits", tags=["visits"])
 
@@ -19,31 +22,61 @@ async def create_visit(
     return await visit_controller.create_visit(db, visit)
 
 
-@router.get("", response_model=List[VisitResponse])
+@router.get("", response_model=List[VisitWithBeneficiary])
 async def get_visits(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     beneficiary_type: Optional[str] = Query(None),
     beneficiary_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
-) -> List[VisitResponse]:
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    expand: Optional[str] = Query(
+        None, pattern="^beneficiary$", description="'beneficiary' adds each row's beneficiary name and barangay"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+) -> ORJSONResponse:
     """Get all visits."""
-    return await visit_controller.get_visits(
-        db, skip, limit, beneficiary_type, beneficiary_id, status
+    expand_beneficiary = expand == "beneficiary"
+    # Expanded rows also change when a senior or PWD is renamed
+    etag = await check_etag(request, db, ["visit", "senior", "pwd"] if expand_beneficiary else ["visit"])
+    visits = await visit_controller.get_visits(
+        db, skip, limit, beneficiary_type, beneficiary_id, status, after, expand_beneficiary
     )
+    headers = etag_headers(etag)
+    cursor = next_cursor(visits, limit, visit_controller.SORT_COLUMNS)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    # Rows come straight from the database, so skip response_model re-validation
+    return ORJSONResponse(visits, headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_visits(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    beneficiary_type: Optional[str] = Query(None),
+    beneficiary_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None)
+) -> StreamingResponse:
+    """Stream all matching visits as CSV or NDJSON."""
+    query = visit_controller.list_query(beneficiary_type, beneficiary_id, status).order_by(*visit_controller.SORT_COLUMNS)
+    return export_controller.export_response(read_session, query, format, "visits")
 
 
 @router.get("/{visit_id}", response_model=VisitResponse)
 async def get_visit(
+    request: Request,
+    response: Response,
     visit_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> VisitResponse:
     """Get a specific visit."""
-    visit = await visit_controller.get_visit(db, visit_id)
+    version = await check_record_etag(request, db, "visit")
+    visit, version = await visit_controller.get_visit(db, visit_id, version)
     if not visit:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Visit not found")
+    response.headers.update(etag_headers(record_etag(request, "visit", version)))
     return visit
 
 
@@ -1,49 +1,48 @@
 """Web routes for HTML templates."""
+import hashlib
+from pathlib import Path
 from typing import List
 from fastapi import APIRouter, Depends, Request, Query
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
+from app.utils.etag import check_etag, etag_headers
+from app.utils.metrics import InstrumentedTemplates
+from app.utils.pagination import next_cursor
 from app.controllers import (
     senior_controller,
     pwd_controller,
     benefit_controller,
     visit_controller,
-    assistance_drive_controller
+    assistance_drive_controller,
+    stats_controller,
+    search_controller
 )
 
-templates = Jinja2Templates(directory="app/templates")
+templates = InstrumentedTemplates(directory="app/templates")
+
+# Part of every page ETag, so pages cached before a template change are re-rendered
+TEMPLATE_FINGERPRINT = hashlib.blake2b(
+    "|".join(
+        f"{path.name}:{path.stat().st_size}:{path.stat().st_mtime_ns}"
+        for path in sorted(Path("app/templates").glob("*.html"))
+    ).encode(),
+    digest_size=8
+).hexdigest()
+
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
+async def dashboard(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Dashboard page."""
-    # Get counts for dashboard
-    seniors = await senior_controller.get_seniors(db, skip=0, limit=1000)
-    pwds = await pwd_controller.get_pwds(db, skip=0, limit=1000)
-    benefits = await benefit_controller.get_benefits(db, skip=0, limit=1000)
-    visits = await visit_controller.get_visits(db, skip=0, limit=1000)
-    drives = await assistance_drive_controller.get_assistance_drives(db, skip=0, limit=1000)
-    
-    active_seniors = len([s for s in seniors if s.is_active])
-    active_pwds = len([p for p in pwds if p.is_active])
-    
+    etag = await check_etag(request, db, stats_controller.COUNTED_COLUMNS, TEMPLATE_FINGERPRINT)
+    stats = await stats_controller.get_dashboard_stats(db)
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
-        "total_seniors": len(seniors),
-        "active_seniors": active_seniors,
-        "total_pwds": len(pwds),
-        "active_pwds": active_pwds,
-        "total_benefits": len(benefits),
-        "pending_benefits": len([b for b in benefits if b.status == "pending"]),
-        "total_visits": len(visits),
-        "scheduled_visits": len([v for v in visits if v.status == "scheduled"]),
-        "total_drives": len(drives),
-        "ongoing_drives": len([d for d in drives if d.status == "ongoing"])
-    })
+        **stats.model_dump()
+    }, headers=etag_headers(etag))
 
 
 @router.get("/seniors", response_class=HTMLResponse)
@@ -51,25 +50,34 @@ async def seniors_list(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
+    after: str = Query(None),
     barangay: str = Query(None),
     is_active: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    q: str = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Senior citizens list page."""
+    etag = await check_etag(request, db, ["senior"], TEMPLATE_FINGERPRINT)
     # Convert string to boolean if provided
     is_active_bool = None
     if is_active is not None:
         is_active_bool = is_active.lower() == "true"
     
-    seniors = await senior_controller.get_seniors(db, skip, limit, barangay, is_active_bool)
+    if q:
+        seniors = await search_controller.search_seniors(db, q, limit, barangay, is_active_bool)
+    else:
+        seniors = await senior_controller.get_seniors(db, skip, limit, barangay, is_active_bool, after)
     return templates.TemplateResponse("seniors.html", {
         "request": request,
         "seniors": seniors,
+        "q": q,
         "skip": skip,
         "limit": limit,
+        "after": after,
+        "next_after": None if q else next_cursor(seniors, limit, senior_controller.SORT_COLUMNS),
         "barangay": barangay,
         "is_active": is_active_bool
-    })
+    }, headers=etag_headers(etag))
 
 
 @router.get("/pwds", response_class=HTMLResponse)
@@ -77,25 +85,34 @@ async def pwds_list(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
+    after: str = Query(None),
     barangay: str = Query(None),
     is_active: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    q: str = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """PWDs list page."""
+    etag = await check_etag(request, db, ["pwd"], TEMPLATE_FINGERPRINT)
     # Convert string to boolean if provided
     is_active_bool = None
     if is_active is not None:
         is_active_bool = is_active.lower() == "true"
     
-    pwds = await pwd_controller.get_pwds(db, skip, limit, barangay, is_active_bool)
+    if q:
+        pwds = await search_controller.search_pwds(db, q, limit, barangay, is_active_bool)
+    else:
+        pwds = await pwd_controller.get_pwds(db, skip, limit, barangay, is_active_bool, after)
     return templates.TemplateResponse("pwds.html", {
         "request": request,
         "pwds": pwds,
+        "q": q,
         "skip": skip,
         "limit": limit,
+        "after": after,
+        "next_after": None if q else next_cursor(pwds, limit, pwd_controller.SORT_COLUMNS),
         "barangay": barangay,
         "is_active": is_active_bool
-    })
+    }, headers=etag_headers(etag))
 
 
 @router.get("/benefits", response_class=HTMLResponse)
@@ -103,18 +120,22 @@ async def benefits_list(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
+    after: str = Query(None),
     status: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Benefits list page."""
-    benefits = await benefit_controller.get_benefits(db, skip, limit, None, None, status)
+    etag = await check_etag(request, db, ["benefit", "senior", "pwd"], TEMPLATE_FINGERPRINT)
+    benefits = await benefit_controller.get_benefits(db, skip, limit, None, None, status, after, expand_beneficiary=True)
     return templates.TemplateResponse("benefits.html", {
         "request": request,
         "benefits": benefits,
         "skip": skip,
         "limit": limit,
+        "after": after,
+        "next_after": next_cursor(benefits, limit, benefit_controller.SORT_COLUMNS),
         "status": status
-    })
+    }, headers=etag_headers(etag))
 
 
 @router.get("/visits", response_class=HTMLResponse)
@@ -122,18 +143,22 @@ async def visits_list(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
+    after: str = Query(None),
     status: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Visits list page."""
-    visits = await visit_controller.get_visits(db, skip, limit, None, None, status)
+    etag = await check_etag(request, db, ["visit", "senior", "pwd"], TEMPLATE_FINGERPRINT)
+    visits = await visit_controller.get_visits(db, skip, limit, None, None, status, after, expand_beneficiary=True)
     return templates.TemplateResponse("visits.html", {
         "request": request,
         "visits": visits,
         "skip": skip,
         "limit": limit,
+        "after": after,
+        "next_after": next_cursor(visits, limit, visit_controller.SORT_COLUMNS),
         "status": status
-    })
+    }, headers=etag_headers(etag))
 
 
 @router.get("/assistance-drives", response_class=HTMLResponse)
@@ -141,16 +166,20 @@ async def assistance_drives_list(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
+    after: str = Query(None),
     status: str = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Assistance drives list page."""
-    drives = await assistance_drive_controller.get_assistance_drives(db, skip, limit, status, None)
+    etag = await check_etag(request, db, ["assistance_drive"], TEMPLATE_FINGERPRINT)
+    drives = await assistance_drive_controller.get_assistance_drives(db, skip, limit, status, None, after)
     return templates.TemplateResponse("assistance_drives.html", {
         "request": request,
         "drives": drives,
         "skip": skip,
         "limit": limit,
+        "after": after,
+        "next_after": next_cursor(drives, limit, assistance_drive_controller.SORT_COLUMNS),
         "status": status
-    })
+    }, headers=etag_headers(etag))
 
@@ -0,0 +1,100 @@
+"""In-process LRU/TTL cache for single-record lookups.
+
+``get_*`` controllers read through ``record_cache`` keyed by
+``(entity, id)``; ``update_*``/``delete_*`` invalidate their key after
+committing. The cache lives in one process, so a change made by another
+worker or by ``manage.py`` is only seen once the entry expires after
+``ttl`` seconds. Each entry keeps the ``{entity}.version`` counter its
+caller read before loading it, so a response served from the cache can
+carry the ETag of that version rather than a newer one (see
+``app/utils/etag.py``).
+
+A load that started before an invalidation is not stored (see
+``generation``), so a slow read racing a write cannot put the old row
+back into the cache.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class RecordCache:
+    """Size-bounded LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 10.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, int, Any]]" = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are stored at all."""
+        return self.max_size > 0
+
+    def get(self, entity: str, record_id: Hashable) -> Optional[Tuple[Any, int]]:
+        """Cached value of a record and the table version it was loaded at, or None on a miss."""
+        key = (entity, record_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, version, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, version
+
+    def set(self, entity: str, record_id: Hashable, value: Any, generation: int, version: int) -> None:
+        """Store a record loaded at table ``version`` unless something was invalidated since ``generation``."""
+        if not self.enabled or generation != self.generation:
+            return
+        key = (entity, record_id)
+        self._entries[key] = (time.monotonic() + self.ttl, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, entity: str, record_id: Hashable) -> None:
+        """Drop a record after it was updated or deleted."""
+        self.generation += 1
+        if self._entries.pop((entity, record_id), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# RECORD_CACHE_SIZE=0 disables the cache
+record_cache = RecordCache(
+    max_size=int(os.getenv("RECORD_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RECORD_CACHE_TTL", "10"))
+)
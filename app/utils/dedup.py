@@ -0,0 +1,128 @@
+"""Name normalization and matching helpers for duplicate detection.
+
+Records are grouped by a blocking key (phonetic surname key, birth date,
+normalized barangay) so only records sharing a key are compared, which
+keeps the job near-linear instead of comparing every pair.
+"""
+import re
+import unicodedata
+from datetime import date
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Spelling variants common in Filipino and Spanish-derived names
+_PHONETIC_REWRITES = (
+    ("ph", "f"),
+    ("ll", "ly"),
+    ("qu", "k"),
+    ("q", "k"),
+    ("ce", "se"),
+    ("ci", "si"),
+    ("c", "k"),
+    ("x", "ks"),
+    ("z", "s"),
+    ("v", "b"),
+    ("j", "h"),
+)
+
+_NON_ALPHA = re.compile(r"[^a-z]+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_NON_DIGIT = re.compile(r"\D")
+
+_SOUND_GROUPS = {
+    **dict.fromkeys("bfp", "1"),
+    **dict.fromkeys("gks", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def normalize_name(value: Optional[str], keep_digits: bool = False) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_only = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    pattern = _NON_ALNUM if keep_digits else _NON_ALPHA
+    return " ".join(pattern.sub(" ", ascii_only.lower()).split())
+
+
+def phonetic_key(value: Optional[str]) -> str:
+    """Soundex-style key tolerant of common spelling variants.
+
+    Spaces are dropped first so "Dela Cruz", "De la Cruz" and "Delacruz"
+    share a key.
+    """
+    word = normalize_name(value).replace(" ", "")
+    if not word:
+        return ""
+    for old, new in _PHONETIC_REWRITES:
+        word = word.replace(old, new)
+
+    key = word[0]
+    previous = _SOUND_GROUPS.get(word[0], "")
+    for ch in word[1:]:
+        code = _SOUND_GROUPS.get(ch, "")
+        if code and code != previous:
+            key += code
+        if ch not in "hwy":
+            previous = code
+    return key[:6]
+
+
+def blocking_key(last_name: str, birth_date: date, barangay: str) -> Tuple[str, date, str]:
+    """Key shared by records that may be the same person."""
+    return phonetic_key(last_name), birth_date, normalize_name(barangay, keep_digits=True)
+
+
+def prepare_record(row: Mapping[str, Any]) -> Dict[str, str]:
+    """Normalize the fields compared by ``match_score`` once per record."""
+    return {
+        "first_name": normalize_name(row["first_name"]),
+        "last_name": normalize_name(row["last_name"]).replace(" ", ""),
+        "middle_name": normalize_name(row.get("middle_name")),
+        "gender": normalize_name(row.get("gender")),
+        "contact_number": _NON_DIGIT.sub("", row.get("contact_number") or ""),
+    }
+
+
+def _similarity(a: str, b: str) -> float:
+    """Similarity ratio of two normalized strings."""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def match_score(a: Mapping[str, str], b: Mapping[str, str]) -> Tuple[float, List[str]]:
+    """Score two prepared records sharing a blocking key, with the reasons found."""
+    reasons = ["same birth date and barangay, similar surname"]
+
+    first = _similarity(a["first_name"], b["first_name"])
+    score = 0.5 * first + 0.2 * _similarity(a["last_name"], b["last_name"])
+    if first >= 0.8:
+        reasons.append("similar first name")
+
+    middle_a, middle_b = a["middle_name"], b["middle_name"]
+    if middle_a and middle_b:
+        if middle_a == middle_b or (middle_a[0] == middle_b[0] and min(len(middle_a), len(middle_b)) == 1):
+            score += 0.15
+            reasons.append("matching middle name")
+        else:
+            score += 0.15 * _similarity(middle_a, middle_b)
+    else:
+        score += 0.075  # unknown middle name is neither evidence for nor against
+
+    if a["gender"] == b["gender"]:
+        score += 0.1
+    else:
+        reasons.append("different gender")
+
+    if a["contact_number"] and a["contact_number"] == b["contact_number"]:
+        score += 0.05
+        reasons.append("same contact number")
+
+    return round(min(score, 1.0), 3), reasons
@@ -0,0 +1,30 @@
+"""SQL that differs between the supported backends (SQLite and PostgreSQL)."""
+from typing import Union
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+
+def dialect_name(db: Union[AsyncSession, AsyncConnection]) -> str:
+    """Backend of a session or connection: ``"sqlite"`` or ``"postgresql"``."""
+    bind = db.bind if isinstance(db, AsyncSession) else db
+    return bind.dialect.name
+
+
+def upsert(db: Union[AsyncSession, AsyncConnection], table):
+    """INSERT with ``on_conflict_do_update``/``on_conflict_do_nothing`` for the backend of ``db``."""
+    if dialect_name(db) == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+async def begin_immediate(db: Union[AsyncSession, AsyncConnection]) -> None:
+    """Open the transaction now, taking SQLite's write lock; PostgreSQL needs nothing.
+
+    pysqlite only issues BEGIN before INSERT, UPDATE and DELETE, so DDL or a
+    SAVEPOINT issued first would run outside any transaction: a DROP
+    TRIGGER would commit on its own, and a savepoint's RELEASE would commit
+    everything written inside it.
+    """
+    if dialect_name(db) == "sqlite":
+        await db.execute(text("BEGIN IMMEDIATE"))
@@ -0,0 +1,74 @@
+"""Conditional GET (ETag / If-None-Match) helpers.
+
+An ETag is a hash of the request URL and the change versions of the tables
+a response is built from (see ``stats_controller.get_versions``), so it is
+known before any row is read. A matching ``If-None-Match`` is answered
+with ``304 Not Modified`` straight away.
+"""
+import hashlib
+from typing import Dict, Iterable, Mapping
+from fastapi import HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers import stats_controller
+
+
+def compute_etag(request: Request, versions: Mapping[str, int], salt: str = "") -> str:
+    """Weak ETag for a URL given the versions of the tables behind it."""
+    parts = [request.url.path, request.url.query, salt]
+    parts.extend(f"{entity}={version}" for entity, version in sorted(versions.items()))
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers that make clients revalidate with If-None-Match on every use."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _check(request: Request, etag: str) -> None:
+    """Raise 304 if the client already has ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=etag_headers(etag))
+
+
+async def check_etag(
+    request: Request,
+    db: AsyncSession,
+    entities: Iterable[str],
+    salt: str = ""
+) -> str:
+    """Return the ETag for this request, or raise 304 if the client has it."""
+    versions = await stats_controller.get_versions(db, entities)
+    etag = compute_etag(request, versions, salt)
+    _check(request, etag)
+    return etag
+
+
+async def check_record_etag(request: Request, db: AsyncSession, entity: str) -> int:
+    """Return the table version for a single-record route, or raise 304 if the client is current.
+
+    The version is passed on to the cached ``get_*`` controller, which
+    returns the version its record was actually loaded at; build the
+    response's ETag from that one with ``record_etag``. A record cached
+    before another worker changed the table is then sent with its older
+    ETag, and the client's next request fetches it again instead of being
+    told its copy is current.
+    """
+    versions = await stats_controller.get_versions(db, [entity])
+    _check(request, record_etag(request, entity, versions[entity]))
+    return versions[entity]
+
+
+def record_etag(request: Request, entity: str, version: int) -> str:
+    """ETag of a single record read at table ``version``."""
+    return compute_etag(request, {entity: version})
@@ -0,0 +1,112 @@
+"""Group commit for bursts of single-row creates.
+
+On a distribution day many tablets create benefits and visits at once, and
+each create pays for its own commit (an fsync of the WAL). With group
+commit on, ``submit`` queues a write and waits; writes that arrive within
+``window`` seconds of the first one, up to ``max_batch`` of them, are
+staged in one transaction and committed together.
+
+Each write runs in its own savepoint, so a failing write is rolled back
+alone and its caller gets its exception while the rest of the batch
+commits. Callers get their result only after the batch committed; if the
+commit itself fails, every caller in the batch gets that error.
+
+Off unless ``GROUP_COMMIT_WINDOW_MS`` is set. The session factory is set
+by app.database.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.utils.dialect import begin_immediate
+from app.utils.writer import write_lock
+
+# stage(session, *args) adds a write to the session without committing
+Stage = Callable[..., Awaitable[Any]]
+
+
+class GroupCommitter:
+    """Batches staged writes into shared transactions."""
+
+    def __init__(self, window: float = 0.0, max_batch: int = 64):
+        self.window = window
+        self.max_batch = max_batch
+        self.session_factory: Optional[async_sessionmaker] = None
+        self._pending: List[Tuple[Stage, tuple, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._commits: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether creates go through group commit."""
+        return self.window > 0 and self.session_factory is not None
+
+    async def submit(self, stage: Stage, *args: Any) -> Any:
+        """Run ``stage(session, *args)`` in the next batch and return its result once committed."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((stage, args, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Start committing everything queued so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._commit(batch))
+            self._commits.add(task)
+            task.add_done_callback(self._commits.discard)
+
+    async def _commit(self, batch: List[Tuple[Stage, tuple, asyncio.Future]]) -> None:
+        staged: List[Tuple[asyncio.Future, Any]] = []
+        try:
+            async with write_lock:
+                async with self.session_factory() as session:
+                    await begin_immediate(session)
+                    for stage, args, future in batch:
+                        if future.done():  # caller went away before its write was staged
+                            continue
+                        try:
+                            async with session.begin_nested():
+                                result = await stage(session, *args)
+                        except Exception as exc:
+                            future.set_exception(exc)
+                        else:
+                            staged.append((future, result))
+                    await session.commit()
+        except BaseException as exc:
+            # Nothing in the batch was written. Answer every caller still
+            # waiting, including those whose write was never staged because
+            # the lock, the session or BEGIN failed or the task was cancelled
+            error = exc if isinstance(exc, Exception) else RuntimeError(
+                f"group commit interrupted by {type(exc).__name__}"
+            )
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if error is not exc:
+                raise
+            return
+
+        self.batches += 1
+        self.writes += len(staged)
+        for future, result in staged:
+            if not future.done():
+                future.set_result(result)
+
+
+# GROUP_COMMIT_WINDOW_MS=0 (the default) leaves group commit off
+group_commit = GroupCommitter(
+    window=float(os.getenv("GROUP_COMMIT_WINDOW_MS", "0")) / 1000,
+    max_batch=int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+)
@@ -0,0 +1,193 @@
+"""Per-request performance instrumentation.
+
+``MetricsMiddleware`` times every request and, through a context variable,
+collects what happened inside it: SQL statements and their time (from
+SQLAlchemy cursor events, see ``install_sql_hooks``), rows returned or
+changed, and Jinja render time (``InstrumentedTemplates``). Totals are
+aggregated per route and served in Prometheus text format at ``/metrics``;
+each response also gets a ``Server-Timing`` header.
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from fastapi.templating import Jinja2Templates
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    """What one request spent its time on."""
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    sql_rows: int = 0
+    render_seconds: float = 0.0
+
+
+@dataclass
+class RouteMetrics:
+    """Aggregated metrics of one (method, route) pair."""
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    sql_rows: int = 0
+    render_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_routes: Dict[Tuple[str, str], RouteMetrics] = defaultdict(RouteMetrics)
+
+
+def record_request(method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+    """Add a finished request to its route's totals."""
+    metrics = _routes[(method, route)]
+    metrics.statuses[str(status)] += 1
+    index = bisect_left(LATENCY_BUCKETS, seconds)
+    if index < len(LATENCY_BUCKETS):
+        metrics.buckets[index] += 1
+    metrics.count += 1
+    metrics.seconds += seconds
+    metrics.sql_statements += stats.sql_statements
+    metrics.sql_seconds += stats.sql_seconds
+    metrics.sql_rows += stats.sql_rows
+    metrics.render_seconds += stats.render_seconds
+
+
+def server_timing(seconds: float, stats: RequestStats) -> str:
+    """Server-Timing header value (durations in milliseconds)."""
+    parts = [
+        f"app;dur={seconds * 1000:.1f}",
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_statements} queries"',
+    ]
+    if stats.render_seconds:
+        parts.append(f"render;dur={stats.render_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(method: str, route: str, **extra: str) -> str:
+    """Prometheus label set of a route series."""
+    pairs = {"method": method, "route": route, **extra}
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs.items())
+
+
+def render_prometheus() -> str:
+    """All route metrics in Prometheus text exposition format."""
+    lines = [
+        "# HELP http_requests_total Requests handled, by route and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    routes = sorted(_routes.items())
+    for (method, route), metrics in routes:
+        for status, count in sorted(metrics.statuses.items()):
+            lines.append(f"http_requests_total{{{_labels(method, route, status=status)}}} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), metrics in routes:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+            cumulative += count
+            lines.append(
+                f"http_request_duration_seconds_bucket{{{_labels(method, route, le=str(bound))}}} {cumulative}"
+            )
+        labels = _labels(method, route)
+        lines.append(f'http_request_duration_seconds_bucket{{{_labels(method, route, le="+Inf")}}} {metrics.count}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+    for name, attribute, help_text in (
+        ("http_request_sql_statements_total", "sql_statements", "SQL statements executed."),
+        ("http_request_sql_seconds_total", "sql_seconds", "Time spent executing SQL."),
+        ("http_request_sql_rows_total", "sql_rows", "Rows returned by queries or changed by writes."),
+        ("http_request_template_render_seconds_total", "render_seconds", "Time spent rendering templates."),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (method, route), metrics in routes:
+            value = getattr(metrics, attribute)
+            value = f"{value:.6f}" if isinstance(value, float) else str(value)
+            lines.append(f"{name}{{{_labels(method, route)}}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request and adding Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(time.perf_counter() - start, stats)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # The router stores the matched route in the scope; unmatched
+            # paths share one label to keep the series count bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            record_request(scope["method"], route, status, time.perf_counter() - start, stats)
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """Count statements, SQL time and rows of each request on ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.sql_statements += 1
+        stats.sql_seconds += time.perf_counter() - context._metrics_start
+        # The aiosqlite adapter buffers SELECT results on the cursor; for
+        # writes rowcount is the number of rows changed
+        rows = getattr(cursor, "_rows", None)
+        stats.sql_rows += len(rows) if rows is not None and cursor.description else max(cursor.rowcount, 0)
+
+
+class InstrumentedTemplates(Jinja2Templates):
+    """Jinja2Templates that adds render time to the current request's stats."""
+
+    def TemplateResponse(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().TemplateResponse(*args, **kwargs)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.render_seconds += time.perf_counter() - start
@@ -0,0 +1,65 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque URL-safe token holding the sort-key values of the
+last row of a page, e.g. ``(last_name, first_name, id)`` for seniors. The
+next page is fetched with ``WHERE (sort key) > (cursor values)`` so every
+page costs the same index seek no matter how deep it is.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Mapping, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import Date, DateTime, Integer, literal, tuple_
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values into an opaque cursor token."""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor token into values typed like the sort columns."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [_coerce(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+
+
+def _coerce(value: Any, column: Any) -> Any:
+    """Convert a JSON cursor value back to the column's Python type."""
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    if isinstance(column.type, Integer):
+        return int(value)
+    return value
+
+
+def keyset_filter(columns: Sequence[Any], token: str, descending: bool = False):
+    """WHERE clause selecting rows after the cursor in sort order."""
+    values = decode_cursor(token, columns)
+    row = tuple_(*columns)
+    bound = tuple_(*(literal(v, type_=c.type) for v, c in zip(values, columns)))
+    return row < bound if descending else row > bound
+
+
+def next_cursor(items: Sequence[Any], limit: int, columns: Sequence[Any]) -> Optional[str]:
+    """Cursor for the page after ``items``, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor([last[column.key] for column in columns])
+    return encode_cursor([getattr(last, column.key) for column in columns])
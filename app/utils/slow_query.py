@@ -0,0 +1,220 @@
+"""Slow-query log with automatic query plan capture.
+
+``install_slow_query_log`` hooks the engine's cursor events. The first
+time a statement runs longer than the threshold it is logged with its
+redacted parameters, duration, the controller function that issued it and
+its query plan (``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` on
+PostgreSQL); plans that scan a whole table are called out. Repeats of
+the same statement are only counted, and every ``summary_interval``
+seconds (and at shutdown) one summary of all slow statements is logged,
+worst total time first.
+"""
+import logging
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+CONTROLLERS_DIR = str(Path(APP_DIR) / "controllers")
+
+# Bind parameters whose values are never personal data. Anything else that
+# is a string or date (names, birth dates, addresses, ID numbers, notes,
+# search terms, cursor values) is redacted.
+SAFE_PARAMS = {
+    "id", "beneficiary_id", "beneficiary_type", "benefit_type", "barangay",
+    "status", "is_active", "visit_type", "drive_type", "target_beneficiaries",
+    "distribution_date", "visit_date", "start_date", "end_date",
+    "created_at", "updated_at", "name", "version_num",
+}
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# SQLite "SCAN senior" without an index, PostgreSQL "Seq Scan on senior".
+# SQLite also "scans" materialized subqueries, which SQLAlchemy names
+# anon_1, anon_2, ..., and the single row of a constant SELECT; neither is
+# a table.
+_FULL_SCAN = re.compile(
+    r"\bSCAN (?!CONSTANT ROW\b|anon_\d+\b)(\w+)\b(?! USING (?:COVERING )?INDEX| VIRTUAL TABLE)"
+    r"|\bSeq Scan on (?!anon_\d+\b)(\w+)"
+)
+_BIND_SUFFIX = re.compile(r"_\d+$")
+
+
+@dataclass
+class SlowStatement:
+    """Aggregated occurrences of one slow SQL statement."""
+    statement: str
+    caller: str
+    plan: List[str]
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+def redact_parameters(names: Optional[Sequence[str]], parameters: Any) -> Any:
+    """Parameters safe to log: personal data replaced by ``'<redacted>'``."""
+    if isinstance(parameters, list):
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        names, parameters = list(parameters), list(parameters.values())
+    redacted = []
+    for index, value in enumerate(parameters or ()):
+        name = names[index] if names and index < len(names) else ""
+        if _BIND_SUFFIX.sub("", name) in SAFE_PARAMS or not isinstance(value, (str, bytes, date)):
+            redacted.append(value)
+        else:
+            redacted.append("<redacted>")
+    return tuple(redacted)
+
+
+def find_caller() -> str:
+    """Controller function that issued the statement, e.g.
+    ``senior_controller.create_senior:24 -> stats_controller.adjust_counters:76``.
+
+    Statements run in a greenlet spawned by SQLAlchemy's asyncio layer, so
+    the awaiting coroutine frames are reached through the parent greenlet.
+    Without a controller frame the first other application frame is used.
+    """
+    controllers = []
+    fallback = "unknown"
+    frame = sys._getframe(1)
+    glet = getcurrent()
+    while glet is not None:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(APP_DIR) and filename != __file__:
+                location = f"{Path(filename).stem}.{frame.f_code.co_name}:{frame.f_lineno}"
+                if filename.startswith(CONTROLLERS_DIR):
+                    controllers.append(location)
+                elif fallback == "unknown" and not filename.endswith(("database.py", "metrics.py")):
+                    fallback = location
+            frame = frame.f_back
+        glet = glet.parent
+        frame = glet.gr_frame if glet is not None else None
+
+    if not controllers:
+        return fallback
+    if len(controllers) == 1:
+        return controllers[0]
+    return f"{controllers[-1]} -> {controllers[0]}"
+
+
+def explain(dbapi_connection, statement: str, parameters: Any, dialect: str = "sqlite") -> List[str]:
+    """Query plan rows of a statement, run on the raw connection."""
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    if isinstance(parameters, list):
+        parameters = parameters[0] if parameters else ()
+    cursor = dbapi_connection.cursor()
+    try:
+        if dialect == "postgresql":
+            # A failed statement aborts a PostgreSQL transaction; keep the
+            # caller's transaction usable whatever EXPLAIN does
+            cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(f"EXPLAIN {statement}", parameters or ())
+                return [row[-1] for row in cursor.fetchall()]
+            finally:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:  # the plan is diagnostic only
+        return [f"<EXPLAIN failed: {exc}>"]
+    finally:
+        cursor.close()
+
+
+def full_scans(plan: Sequence[str]) -> List[str]:
+    """Tables a query plan reads in full."""
+    return sorted({
+        match.group(1) or match.group(2)
+        for line in plan for match in _FULL_SCAN.finditer(line)
+    })
+
+
+class SlowQueryLog:
+    """Records statements slower than ``threshold`` seconds."""
+
+    def __init__(self, threshold: float, summary_interval: float = 300.0):
+        self.threshold = threshold
+        self.summary_interval = summary_interval
+        self.statements: Dict[str, SlowStatement] = {}
+        self.last_summary = time.monotonic()
+
+    def record(self, conn, context, statement: str, parameters: Any, seconds: float) -> None:
+        """Log a slow statement the first time, count it afterwards."""
+        slow = self.statements.get(statement)
+        if slow is None:
+            names = getattr(context.compiled, "positiontup", None)
+            slow = SlowStatement(
+                statement=statement,
+                caller=find_caller(),
+                plan=explain(conn.connection.dbapi_connection, statement, parameters, conn.dialect.name)
+            )
+            self.statements[statement] = slow
+            scans = full_scans(slow.plan)
+            logger.warning(
+                "Slow query (%.1f ms) from %s%s\n%s\nparameters: %r\nplan:\n  %s",
+                seconds * 1000,
+                slow.caller,
+                f" - full scan of {', '.join(scans)}" if scans else "",
+                statement,
+                redact_parameters(names, parameters),
+                "\n  ".join(slow.plan) or "(not explainable)"
+            )
+        slow.count += 1
+        slow.total_seconds += seconds
+        slow.max_seconds = max(slow.max_seconds, seconds)
+
+        if time.monotonic() - self.last_summary >= self.summary_interval:
+            self.log_summary()
+
+    def log_summary(self) -> None:
+        """Log every slow statement seen since the last summary, then reset."""
+        self.last_summary = time.monotonic()
+        if not self.statements:
+            return
+        lines = []
+        for slow in sorted(self.statements.values(), key=lambda s: -s.total_seconds):
+            scans = full_scans(slow.plan)
+            lines.append(
+                f"  {slow.count:>5}x  total {slow.total_seconds * 1000:9.1f} ms"
+                f"  max {slow.max_seconds * 1000:8.1f} ms  {slow.caller}"
+                f"{'  [SCAN ' + ', '.join(scans) + ']' if scans else ''}"
+                f"\n         {' '.join(slow.statement.split())[:200]}"
+            )
+        logger.warning("Slow query summary, %d statement(s):\n%s", len(lines), "\n".join(lines))
+        self.statements.clear()
+
+
+def install_slow_query_log(
+    engine: Engine,
+    threshold: float,
+    summary_interval: float = 300.0,
+    slow_log: Optional[SlowQueryLog] = None
+) -> SlowQueryLog:
+    """Log statements on ``engine`` slower than ``threshold`` seconds.
+
+    Pass the ``slow_log`` of another engine to report both in one summary.
+    """
+    if slow_log is None:
+        slow_log = SlowQueryLog(threshold, summary_interval)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._slow_query_start
+        if seconds >= slow_log.threshold:
+            slow_log.record(conn, context, statement, parameters, seconds)
+
+    return slow_log
@@ -0,0 +1,121 @@
+"""Single-writer lock for SQLite.
+
+SQLite allows one writer at a time. With several worker processes,
+concurrent write transactions wait on ``busy_timeout`` and can still fail
+with "database is locked" (a transaction that read before another process
+committed cannot upgrade to a write). Every write in the controllers
+therefore runs under ``write_lock``: an asyncio lock queues the writes of
+one process, and an exclusive ``flock`` on a lock file next to the
+database queues the processes. Reads take no lock and run in parallel on
+every worker.
+
+The lock is re-entrant within a task, so a locked controller may call
+another one. On PostgreSQL app.database turns it off (``enabled``).
+"""
+import asyncio
+import functools
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writes within one process are serialized
+    fcntl = None
+
+T = TypeVar("T")
+
+# Backoff between attempts to take the file lock held by another process
+FLOCK_POLL_MIN = 0.001
+FLOCK_POLL_MAX = 0.02
+
+
+class WriteLock:
+    """Process-local asyncio lock plus a cross-process file lock."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.enabled = True
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task] = None
+        self._depth = 0
+        self._fd: Optional[int] = None
+        self.waits = 0  # acquisitions that had to wait for another process
+
+    async def acquire(self) -> None:
+        if not self.enabled:
+            return
+        task = asyncio.current_task()
+        if self._owner is task:
+            self._depth += 1
+            return
+        await self._lock.acquire()
+        try:
+            await self._lock_file()
+        except BaseException:
+            self._lock.release()
+            raise
+        self._owner = task
+        self._depth = 1
+
+    def release(self) -> None:
+        if not self.enabled:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+        self._owner = None
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    async def _lock_file(self) -> None:
+        if fcntl is None or self.path is None:
+            return
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = FLOCK_POLL_MIN
+        waited = False
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                # Another process is writing. Poll instead of blocking in a
+                # thread: a cancelled waiter must not take the lock later
+                # with nobody left to release it.
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, FLOCK_POLL_MAX)
+
+    async def __aenter__(self) -> "WriteLock":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+# The lock file path is set by app.database once the database path is known
+write_lock = WriteLock()
+
+
+def single_writer(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Run a controller write (``db`` first argument) under ``write_lock``.
+
+    A failed write is rolled back before the lock is released, so its
+    transaction cannot keep SQLite's write lock while other writers run.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(db, *args: Any, **kwargs: Any) -> T:
+        async with write_lock:
+            try:
+                return await func(db, *args, **kwargs)
+            except BaseException:
+                await db.rollback()
+                raise
+
+    return wrapper
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Compare list-endpoint serialization before and after the plain-row fast path.
+
+"before" reproduces the old path: load ORM objects, ``model_validate`` each
+row, re-validate the list through the ``response_model`` and render it with
+``jsonable_encoder`` + ``JSONResponse`` (what FastAPI does for a returned
+list). "after" is the current ``get_seniors`` (plain column rows as dicts)
+rendered with ``ORJSONResponse``.
+
+The database is a throwaway file in a temporary directory, so the
+development database is never touched.
+
+    python benchmarks/list_serialization.py --rows 5000 --page 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DATABASE_PATH"] = str(Path(tempfile.mkdtemp(prefix="brgy-bench-")) / "bench.db")
+
+from typing import List  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from app.database import async_session, init_db  # noqa: E402
+from app.controllers import senior_controller  # noqa: E402
+from app.models.senior import Senior, SeniorResponse  # noqa: E402
+
+BARANGAYS = ["San Roque", "Poblacion", "San Isidro", "Santa Cruz", "Bagong Silang"]
+
+
+async def seed(rows: int) -> None:
+    """Insert ``rows`` synthetic senior citizens."""
+    today = date.today()
+    records = [
+        {
+            "first_name": f"Juan{i}",
+            "middle_name": "Santos",
+            "last_name": f"Dela Cruz{i % 997}",
+            "birth_date": date(1940, 1, 1) + timedelta(days=i % 9000),
+            "gender": "Male" if i % 2 else "Female",
+            "address": f"Purok {i % 7}",
+            "barangay": BARANGAYS[i % len(BARANGAYS)],
+            "contact_number": "09171234567",
+            "osca_id": f"OSCA-{i:07d}",
+            "is_active": i % 10 != 0,
+            "notes": None,
+            "created_at": today,
+            "updated_at": today,
+        }
+        for i in range(rows)
+    ]
+    async with async_session() as session:
+        await session.execute(insert(Senior.__table__), records)
+        await session.commit()
+
+
+async def before(page: int) -> bytes:
+    """Old path: ORM objects, per-row validation, response_model re-validation."""
+    async with async_session() as session:
+        query = select(Senior).order_by(*senior_controller.SORT_COLUMNS).limit(page)
+        result = await session.execute(query)
+        seniors = [SeniorResponse.model_validate(senior) for senior in result.scalars().all()]
+    validated = TypeAdapter(List[SeniorResponse]).validate_python(
+        [senior.model_dump() for senior in seniors]
+    )
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+async def after(page: int) -> bytes:
+    """Fast path: plain column rows rendered with orjson."""
+    async with async_session() as session:
+        seniors = await senior_controller.get_seniors(session, limit=page)
+    return ORJSONResponse(seniors).body
+
+
+async def measure(func, page: int, repeat: int) -> List[float]:
+    """Run ``func`` ``repeat`` times and return the latencies in milliseconds."""
+    await func(page)  # warm up caches and the connection pool
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func(page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    await init_db()
+    await seed(args.rows)
+
+    print(f"{args.rows} seniors, {args.page}-row pages, {args.repeat} runs each")
+    results = {}
+    for name, func in (("before", before), ("after", after)):
+        timings = await measure(func, args.page, args.repeat)
+        results[name] = statistics.median(timings)
+        print(
+            f"  {name:<6}  p50 {statistics.median(timings):7.2f} ms"
+            f"  min {min(timings):7.2f} ms  max {max(timings):7.2f} ms"
+        )
+    print(f"  speedup {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="seniors to seed")
+    parser.add_argument("--page", type=int, default=1000, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per variant")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""Benchmark every route in process against a throwaway database.
+
+Builds a temporary SQLite database (or fills the empty database given
+with ``--database-url``, e.g. PostgreSQL) of the requested size with the
+generator behind ``manage.py seed``, then drives each route of the
+application through an in-process ASGI client, first one request at a
+time and then ``--concurrency`` requests at a time. For every
+route and mode it reports p50/p95/p99 latency, throughput and the peak RSS
+of the process, and writes the results as JSON.
+
+With ``--baseline`` the run is compared against stored results and the
+script exits with status 1 when a route's p95 latency or throughput
+regressed by more than ``--tolerance``:
+
+    python benchmarks/suite.py --seniors 10000 --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --seniors 10000 --baseline benchmarks/baseline.json
+
+Every application route must have a scenario below; the suite refuses to
+run when one is missing, so new routes get benchmarked too.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import resource
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_DIR / "benchmarks" / "results"
+sys.path.insert(0, str(REPO_DIR))
+# main.py serves templates and static files relative to the repository root
+os.chdir(REPO_DIR)
+
+from app.controllers.seed_controller import BARANGAYS, FEMALE_NAMES, SURNAMES, seed_database  # noqa: E402
+
+
+# --- scenarios ----------------------------------------------------------
+
+@dataclass
+class Scenario:
+    """One benchmarked request shape for a route."""
+    method: str
+    route: str
+    build: Callable[["Context", int], Tuple[str, Dict[str, Any]]]
+    label: str = ""
+    heavy: bool = False  # full-table work; run with a tenth of the requests (at least 3)
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}{' ' + self.label if self.label else ''}"
+
+
+class Context:
+    """Dataset sizes, a seeded RNG and ids created during the run."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed + 1)
+        self.created: Dict[str, List[int]] = {}
+        self.unique = 0
+
+    def next_unique(self) -> int:
+        self.unique += 1
+        return self.unique
+
+    def existing(self, entity: str) -> int:
+        count = {"senior": self.args.seniors, "pwd": self.args.pwds, "benefit": self.args.benefits,
+                 "visit": self.args.visits, "assistance_drive": self.args.drives}[entity]
+        return self.rng.randint(1, max(count, 1))
+
+    def logged_rows(self) -> int:
+        """Change log entries of the seeded rows, one per row."""
+        args = self.args
+        return args.seniors + args.pwds + args.benefits + args.visits + args.drives
+
+    def take_created(self, entity: str) -> int:
+        return self.created[entity].pop()
+
+
+def _senior_body(ctx: Context) -> Dict[str, Any]:
+    n = ctx.next_unique()
+    return {"first_name": ctx.rng.choice(FEMALE_NAMES), "last_name": ctx.rng.choice(SURNAMES),
+            "birth_date": "1950-05-17", "gender": "Female", "address": "Purok 2",
+            "barangay": ctx.rng.choice(BARANGAYS), "osca_id": f"BENCH-S-{n}"}
+
+
+def _pwd_body(ctx: Context) -> Dict[str, Any]:
+    n = ctx.next_unique()
+    return {"first_name": ctx.rng.choice(FEMALE_NAMES), "last_name": ctx.rng.choice(SURNAMES),
+            "birth_date": "1985-03-02", "gender": "Male", "address": "Purok 4",
+            "barangay": ctx.rng.choice(BARANGAYS), "disability_type": "mobility", "pwd_id": f"BENCH-P-{n}"}
+
+
+def _import_file(ctx: Context, id_column: str, extra: str = "") -> Dict[str, Any]:
+    header = f"first_name,last_name,birth_date,gender,address,barangay,{id_column}{',disability_type' if extra else ''}"
+    lines = [header]
+    for _ in range(20):
+        n = ctx.next_unique()
+        lines.append(f"Juan,Santos,1950-01-01,Male,Purok 1,Poblacion,BENCH-I-{n}{',' + extra if extra else ''}")
+    return {"files": {"file": ("import.csv", "\n".join(lines).encode(), "text/csv")}}
+
+
+def _crud(prefix: str, entity: str, id_name: str, create_body, list_filter: Dict[str, str]) -> List[Scenario]:
+    """Scenarios for the routes every entity router has."""
+    return [
+        Scenario("GET", prefix, lambda ctx, i: (prefix, {})),
+        Scenario("GET", prefix, lambda ctx, i: (prefix, {"params": {**list_filter, "limit": 50}}), "filtered"),
+        Scenario("GET", prefix, lambda ctx, i: (prefix, {"params": {"limit": 1000}}), "1000 rows"),
+        Scenario("GET", f"{prefix}/export", lambda ctx, i: (f"{prefix}/export", {"params": list_filter}), heavy=True),
+        Scenario("GET", f"{prefix}/{{{id_name}}}", lambda ctx, i: (f"{prefix}/{ctx.existing(entity)}", {})),
+        Scenario("POST", prefix, lambda ctx, i: (prefix, {"json": create_body(ctx)})),
+        Scenario("PUT", f"{prefix}/{{{id_name}}}",
+                 lambda ctx, i: (f"{prefix}/{ctx.existing(entity)}", {"json": {"notes" if entity != "assistance_drive" else "description": "benchmark"}})),
+        Scenario("DELETE", f"{prefix}/{{{id_name}}}", lambda ctx, i: (f"{prefix}/{ctx.take_created(entity)}", {})),
+    ]
+
+
+def build_scenarios() -> List[Scenario]:
+    """Every benchmarked request, in run order (writes that delete come last)."""
+    benefit_body = lambda ctx: {"beneficiary_type": "senior", "beneficiary_id": ctx.existing("senior"),  # noqa: E731
+                                "benefit_type": "rice", "distribution_date": date.today().isoformat()}
+    visit_body = lambda ctx: {"beneficiary_type": "pwd", "beneficiary_id": ctx.existing("pwd"),  # noqa: E731
+                              "visit_date": date.today().isoformat(), "visit_type": "checkup"}
+    drive_body = lambda ctx: {"drive_name": "Benchmark drive", "drive_type": "food",  # noqa: E731
+                              "target_beneficiaries": "both", "start_date": date.today().isoformat(),
+                              "location": "Barangay Hall"}
+
+    scenarios = [
+        Scenario("GET", "/", lambda ctx, i: ("/", {})),
+        Scenario("GET", "/seniors", lambda ctx, i: ("/seniors", {})),
+        Scenario("GET", "/seniors", lambda ctx, i: ("/seniors", {"params": {"q": ctx.rng.choice(SURNAMES)}}), "search"),
+        Scenario("GET", "/pwds", lambda ctx, i: ("/pwds", {})),
+        Scenario("GET", "/benefits", lambda ctx, i: ("/benefits", {})),
+        Scenario("GET", "/visits", lambda ctx, i: ("/visits", {})),
+        Scenario("GET", "/assistance-drives", lambda ctx, i: ("/assistance-drives", {})),
+        Scenario("GET", "/api", lambda ctx, i: ("/api", {})),
+        Scenario("GET", "/api/stats", lambda ctx, i: ("/api/stats", {})),
+        Scenario("GET", "/api/stats/cache", lambda ctx, i: ("/api/stats/cache", {})),
+        Scenario("POST", "/api/stats/rebuild", lambda ctx, i: ("/api/stats/rebuild", {}), heavy=True),
+        Scenario("GET", "/api/search", lambda ctx, i: ("/api/search", {"params": {"q": ctx.rng.choice(FEMALE_NAMES)}})),
+        Scenario("GET", "/api/duplicates",
+                 lambda ctx, i: ("/api/duplicates", {"params": {"type": "senior", "barangay": ctx.rng.choice(BARANGAYS)}}),
+                 heavy=True),
+        Scenario("GET", "/metrics", lambda ctx, i: ("/metrics", {})),
+        Scenario("POST", "/api/seniors/import", lambda ctx, i: ("/api/seniors/import", _import_file(ctx, "osca_id"))),
+        Scenario("POST", "/api/pwds/import", lambda ctx, i: ("/api/pwds/import", _import_file(ctx, "pwd_id", "visual"))),
+        Scenario("POST", "/api/assistance-drives/{drive_id}/distribute",
+                 lambda ctx, i: (f"/api/assistance-drives/{ctx.existing('assistance_drive')}/distribute",
+                                 {"json": {"benefit_type": "rice", "barangay": ctx.rng.choice(BARANGAYS)}})),
+        Scenario("GET", "/api/seniors/{senior_id}/timeline",
+                 lambda ctx, i: (f"/api/seniors/{ctx.existing('senior')}/timeline", {})),
+        Scenario("GET", "/api/pwds/{pwd_id}/timeline",
+                 lambda ctx, i: (f"/api/pwds/{ctx.existing('pwd')}/timeline", {})),
+        # Tablets catching up from a random sync point, in small and large batches
+        Scenario("GET", "/api/sync/changes",
+                 lambda ctx, i: ("/api/sync/changes", {"params": {"since": ctx.rng.randint(0, ctx.logged_rows()),
+                                                                   "limit": 50}}), "50 rows"),
+        Scenario("GET", "/api/sync/changes",
+                 lambda ctx, i: ("/api/sync/changes", {"params": {"since": ctx.rng.randint(0, ctx.logged_rows()),
+                                                                   "limit": 1000}}), "1000 rows"),
+    ]
+    scenarios += _crud("/api/seniors", "senior", "senior_id", _senior_body, {"barangay": "Poblacion"})
+    scenarios += _crud("/api/pwds", "pwd", "pwd_id", _pwd_body, {"barangay": "Poblacion"})
+    scenarios += _crud("/api/benefits", "benefit", "benefit_id", benefit_body, {"status": "pending"})
+    scenarios += _crud("/api/visits", "visit", "visit_id", visit_body, {"status": "scheduled"})
+    scenarios += _crud("/api/assistance-drives", "assistance_drive", "drive_id", drive_body, {"status": "ongoing"})
+    scenarios += [
+        Scenario("GET", route, lambda ctx, i, route=route: (route, {"params": {"expand": "beneficiary"}}), "expanded")
+        for route in ("/api/benefits", "/api/visits")
+    ]
+    return scenarios
+
+
+def check_coverage(app, scenarios: List[Scenario]) -> None:
+    """Refuse to run unless every application route has a scenario."""
+    from fastapi.routing import APIRoute
+
+    covered = {(scenario.method, scenario.route) for scenario in scenarios}
+    missing = sorted(
+        f"{method} {route.path}"
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+        if (method, route.path) not in covered
+    )
+    if missing:
+        raise SystemExit("No benchmark scenario for:\n  " + "\n  ".join(missing))
+
+
+# --- running ------------------------------------------------------------
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def summarize(latencies: List[float], wall_seconds: float, errors: int) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and error count of one run."""
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(len(latencies) / wall_seconds, 1) if wall_seconds else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_scenario(client, ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send ``requests`` requests, ``concurrency`` at a time."""
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        url, kwargs = scenario.build(ctx, i)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(scenario.method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+        elif scenario.method == "POST" and scenario.route.count("/") == 2:
+            # Keep created ids so the DELETE scenarios remove rows of their own
+            entity = {"seniors": "senior", "pwds": "pwd", "benefits": "benefit", "visits": "visit",
+                      "assistance-drives": "assistance_drive"}[scenario.route.split("/")[2]]
+            ctx.created.setdefault(entity, []).append(response.json()["id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the database, run every scenario and return the results."""
+    import httpx
+    import main
+    from sqlalchemy import func, select
+    from app.database import async_session, engine, init_db
+    from app.models import Senior
+
+    scenarios = build_scenarios()
+    check_coverage(main.app, scenarios)
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if re.search(args.only, scenario.name)]
+
+    await init_db()
+    async with async_session() as session:
+        if (await session.execute(select(func.count()).select_from(Senior))).scalar():
+            raise SystemExit("the database already has records; the suite needs an empty database")
+    start = time.perf_counter()
+    async with async_session() as session:
+        await seed_database(session, args.seniors, args.pwds, args.benefits, args.visits, args.drives, args.seed)
+    print(f"Seeded {args.seniors} seniors, {args.pwds} PWDs, {args.benefits} benefits, "
+          f"{args.visits} visits, {args.drives} drives in {time.perf_counter() - start:.1f}s")
+
+    ctx = Context(args)
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in scenarios:
+            requests = max(3, args.requests // 10) if scenario.heavy else args.requests
+            if scenario.method == "GET":
+                await client.get(*scenario.build(ctx, 0)[:1])  # warm up
+            results[scenario.name] = {
+                "sequential": await run_scenario(client, ctx, scenario, requests, 1),
+                "concurrent": await run_scenario(client, ctx, scenario, requests, args.concurrency),
+            }
+            print_row(scenario.name, results[scenario.name])
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "database_version": ".".join(map(str, engine.dialect.server_version_info or ())) or sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "dataset": {"seniors": args.seniors, "pwds": args.pwds, "benefits": args.benefits,
+                        "visits": args.visits, "drives": args.drives, "seed": args.seed},
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "results": results,
+    }
+
+
+def print_row(name: str, result: Dict[str, Dict[str, Any]]) -> None:
+    """One line per scenario: sequential and concurrent latency and throughput."""
+    seq, conc = result["sequential"], result["concurrent"]
+    errors = seq["errors"] + conc["errors"]
+    print(
+        f"{name[:58]:<58} p50 {seq['p50_ms']:8.2f}  p95 {seq['p95_ms']:8.2f}  p99 {seq['p99_ms']:8.2f} ms"
+        f"  | c: p95 {conc['p95_ms']:8.2f} ms {conc['throughput_rps']:8.1f} rps"
+        f"{f'  {errors} ERRORS' if errors else ''}"
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions of p95 latency or throughput against the baseline."""
+    regressions = []
+    if current["meta"]["dataset"] != baseline["meta"]["dataset"]:
+        print("WARNING: baseline was recorded with a different dataset:", baseline["meta"]["dataset"])
+    for name, modes in current["results"].items():
+        for mode, now in modes.items():
+            before = baseline["results"].get(name, {}).get(mode)
+            if not before:
+                continue
+            if now["p95_ms"] > before["p95_ms"] * (1 + tolerance) and now["p95_ms"] - before["p95_ms"] > min_delta_ms:
+                regressions.append(f"{name} [{mode}] p95 {before['p95_ms']:.2f} -> {now['p95_ms']:.2f} ms")
+            if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{name} [{mode}] throughput {before['throughput_rps']:.1f} -> {now['throughput_rps']:.1f} rps"
+                )
+            if now["errors"] > before["errors"]:
+                regressions.append(f"{name} [{mode}] errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seniors", type=int, default=10000, help="seniors to seed (default 10000)")
+    parser.add_argument("--pwds", type=int, help="PWDs to seed (default seniors / 4)")
+    parser.add_argument("--benefits", type=int, help="benefits to seed (default 2 x seniors)")
+    parser.add_argument("--visits", type=int, help="visits to seed (default seniors)")
+    parser.add_argument("--drives", type=int, default=50, help="assistance drives to seed")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and requests")
+    parser.add_argument("--requests", type=int, default=50, help="requests per route and mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="in-flight requests in concurrent mode")
+    parser.add_argument("--only", help="regex; only run scenarios whose name matches")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "latest.json"), help="where to write the results")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline path")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 changes smaller than this")
+    parser.add_argument("--database", help="SQLite database file to build (default: a temporary file)")
+    parser.add_argument("--database-url", help="run against this empty database instead, e.g. postgresql+asyncpg://...")
+    args = parser.parse_args(argv)
+    args.pwds = args.seniors // 4 if args.pwds is None else args.pwds
+    args.benefits = args.seniors * 2 if args.benefits is None else args.benefits
+    args.visits = args.seniors if args.visits is None else args.visits
+    return args
+
+
+def main_cli() -> int:
+    args = parse_args()
+    # Must be set before the application (and app.database) is imported
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        database = Path(args.database or Path(tempfile.mkdtemp(prefix="brgy-bench-")) / "bench.db")
+        if database.exists():
+            raise SystemExit(f"{database} already exists; the suite needs an empty database")
+        os.environ["DATABASE_PATH"] = str(database)
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+    results = asyncio.run(run(args))
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\nREGRESSIONS against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -4,13 +4,19 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.database import init_db
+from app.database import init_db, slow_query_log
+from app.utils.metrics import MetricsMiddleware
 from app.routes import (
     senior_routes,
     pwd_routes,
     benefit_routes,
     visit_routes,
     assistance_drive_routes,
+    stats_routes,
+    search_routes,
+    dedup_routes,
+    metrics_routes,
+    sync_routes,
     web_routes
 )
 
@@ -22,6 +28,8 @@ async def lifespan(app: FastAPI):
     await init_db()
     yield
     # Shutdown
+    if slow_query_log:
+        slow_query_log.log_summary()
 
 
 app = FastAPI(
@@ -31,6 +39,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Time every request for /metrics and the Server-Timing header
+app.add_middleware(MetricsMiddleware)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -41,6 +52,11 @@ app.include_router(pwd_routes.router)
 app.include_router(benefit_routes.router)
 app.include_router(visit_routes.router)
 app.include_router(assistance_drive_routes.router)
+app.include_router(stats_routes.router)
+app.include_router(search_routes.router)
+app.include_router(dedup_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(sync_routes.router)
 
 
 @app.get("/api")
@@ -54,7 +70,12 @@ async def api_root():
             "pwds": "/api/pwds",
             "benefits": "/api/benefits",
             "visits": "/api/visits",
-            "assistance_drives": "/api/assistance-drives"
+            "assistance_drives": "/api/assistance-drives",
+            "stats": "/api/stats",
+            "search": "/api/search",
+            "duplicates": "/api/duplicates",
+            "sync": "/api/sync/changes",
+            "metrics": "/metrics"
         }
     }
 
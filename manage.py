@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Maintenance commands for the Barangay Senior & PWD Support Tracker."""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.database import async_session, init_db
+from app.controllers import dedup_controller, seed_controller, stats_controller, sync_controller
+
+
+async def rebuild_stats() -> None:
+    """Recompute the dashboard counters table from the registry tables."""
+    await init_db()
+    async with async_session() as session:
+        stats = await stats_controller.rebuild_counters(session)
+    for name, value in stats.model_dump().items():
+        print(f"{name}: {value}")
+
+
+async def find_duplicates() -> None:
+    """Print merge suggestions for likely duplicate registrations."""
+    await init_db()
+    async with async_session() as session:
+        for beneficiary_type in ("senior", "pwd"):
+            candidates = await dedup_controller.find_duplicates(session, beneficiary_type)
+            print(f"{beneficiary_type}: {len(candidates)} candidate pair(s)")
+            for candidate in candidates:
+                print(
+                    f"  {candidate.score:.2f}  keep #{candidate.keep_id} {candidate.keep_name}"
+                    f"  <-  #{candidate.duplicate_id} {candidate.duplicate_name}"
+                    f"  ({'; '.join(candidate.reasons)})"
+                )
+
+
+async def seed(seniors: int, pwds: int, benefits: int, visits: int, drives: int, seed: int, chunk_size: int) -> None:
+    """Generate synthetic records for load testing."""
+    await init_db()
+    start = time.perf_counter()
+    async with async_session() as session:
+        counts = await seed_controller.seed_database(
+            session, seniors, pwds, benefits, visits, drives, seed, chunk_size
+        )
+    seconds = time.perf_counter() - start
+    total = sum(counts.values())
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+    print(f"{total} rows in {seconds:.1f}s ({total / seconds:,.0f} rows/s)")
+
+
+async def compact_changes(days: int) -> None:
+    """Drop delta sync tombstones older than --days; tablets offline longer re-download everything."""
+    await init_db()
+    async with async_session() as session:
+        removed = await sync_controller.compact_change_log(session, datetime.now() - timedelta(days=days))
+    print(f"{removed} tombstone(s) older than {days} days removed")
+
+
+COMMANDS = {
+    "rebuild-stats": rebuild_stats,
+    "find-duplicates": find_duplicates,
+    "seed": seed,
+    "compact-changes": compact_changes,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild-stats", help=rebuild_stats.__doc__)
+    subparsers.add_parser("find-duplicates", help=find_duplicates.__doc__)
+    seed_parser = subparsers.add_parser("seed", help=seed.__doc__)
+    seed_parser.add_argument("--seniors", type=int, default=10000)
+    seed_parser.add_argument("--pwds", type=int, help="default: seniors / 4")
+    seed_parser.add_argument("--benefits", type=int, help="default: 2 x (seniors + pwds)")
+    seed_parser.add_argument("--visits", type=int, help="default: seniors + pwds")
+    seed_parser.add_argument("--drives", type=int, default=100)
+    seed_parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed gives the same data")
+    seed_parser.add_argument("--chunk-size", type=int, default=seed_controller.CHUNK_SIZE)
+    compact_parser = subparsers.add_parser("compact-changes", help=compact_changes.__doc__)
+    compact_parser.add_argument("--days", type=int, default=90)
+    args = vars(parser.parse_args())
+    command = args.pop("command")
+    if command == "seed":
+        args["pwds"] = args["seniors"] // 4 if args["pwds"] is None else args["pwds"]
+        people = args["seniors"] + args["pwds"]
+        args["benefits"] = people * 2 if args["benefits"] is None else args["benefits"]
+        args["visits"] = people if args["visits"] is None else args["visits"]
+    asyncio.run(COMMANDS[command](**args))
@@ -1,13 +1,31 @@
 #!/usr/bin/env python3
-"""Start the Barangay Senior & PWD Support Tracker application."""
+"""Start the Barangay Senior & PWD Support Tracker application.
+
+    python run.py                # one process with auto-reload (development)
+    python run.py --workers 4    # one process per core (production)
+
+With several workers, reads run in parallel in every process while writes
+are serialized across processes by the write lock in app/utils/writer.py.
+"""
+import argparse
+import os
 import uvicorn
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="worker processes (default: $WEB_CONCURRENCY or 1); more than one disables auto-reload"
+    )
+    args = parser.parse_args()
+
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        reload=args.workers == 1,
+        workers=args.workers,
         log_level="info"
     )
-